@@ -1,6 +1,9 @@
 # 标准库导入
+import array
 import asyncio
 import json
+import logging
+import operator
 import os
 import time
 from typing import Optional
@@ -8,7 +11,7 @@ from typing import Optional
 # 本地模块导入
 from api.ws_client import StandXMarketStream, StandXOrderStream
 from logger import get_logger
-from standx_api import query_positions
+from standx_api import cancel_orders, query_open_orders, query_positions, query_symbol_price
 from standx_auth import StandXAuth
 
 
@@ -22,28 +25,53 @@ class StandXAdapter:
     POSITION_SYNC_TIMEOUT = 3.0  # HTTP API query timeout for position sync
     ORDER_SYNC_TIMEOUT = 3.0     # HTTP API query timeout for order sync
     RECONNECT_SYNC_TIMEOUT = 5.0 # Overall timeout for sync during reconnection
+    POSITION_CLOSE_TIMEOUT = 10.0 # Wait for WS position push confirming close
+    LOGIN_ACK_TIMEOUT = 5.0      # Wait for auth:login response before sending orders
+    RECONNECT_BACKOFF_INITIAL = 0.5  # First retry delay after a failed market stream reconnect
+    RECONNECT_BACKOFF_MAX = 10.0     # Cap for the exponential reconnect backoff
+    ORDER_RETRY_DELAY_INITIAL = 0.5  # Delay before the first order-stream send retry, doubled per attempt
+    POSITION_CLOSE_POLL_INITIAL = 0.5 # First HTTP fallback check while waiting for close
+    POSITION_CLOSE_POLL_MAX = 4.0 # Backoff cap between HTTP fallback checks
     POSITION_QTY_EPSILON = 1e-8  # Tolerance for floating point comparison
+    PRICE_STALE_THRESHOLD = 5.0  # No WS message for this long -> fall back to HTTP price query
+    MID_HISTORY_SIZE = 1024  # Recent mid prices kept in the ring buffer (power of two)
 
     def __init__(self, symbol: str = "BTC-USD", depth_levels: int = 5, midprice_method: str = "vwa"):
         self._market_stream: Optional[StandXMarketStream] = None
         self._order_stream: Optional[StandXOrderStream] = None
+        # 中间价及其时间戳只由推送回调（或 HTTP 兜底）在事件循环线程中直接赋值，读取方直接读属性，无需加锁
         self._depth_mid_price: Optional[float] = None
         self._depth_book_data: Optional[dict] = None  # 保存完整的盘口数据
         self._last_price_update_time: Optional[float] = None
         self._price_updated_and_processed: bool = True
         self._orders_dict: dict = {}  # 改用字典存储，key为order_id
+        self._orders_by_side: dict = {"buy": {}, "sell": {}}  # 按方向索引的订单缓存，与 _orders_dict 同步维护
         self._position: Optional[dict] = {}
         self._last_position_qty: float = 0  # 追踪上一次的持仓数量
+        self._position_update_event: asyncio.Event = asyncio.Event()  # 持仓推送或同步后置位，唤醒持仓监控
         self._last_order_count: int = 0  # 追踪上一次的订单总数，用于检测超量通知
         self._order_confirmed_count: int = 0  # 追踪订单确认次数，用于等待机制
+        self._order_rejected_count: int = 0  # 下单请求被拒次数（order:new 响应 code 非 0），用于提前结束等待
+        self._order_event: asyncio.Event = asyncio.Event()  # 订单缓存变化时置位，唤醒等待确认的协程
+        self._fill_count: int = 0  # 成交推送计数，供上层判断余额等缓存是否失效
         self._price_event: asyncio.Event = asyncio.Event()  # 用于等待新价格更新
-        self._last_full_sync_time: float = 0  # 上次全量同步时间
+        self._price_seq: int = 0  # 中间价推送序号（单调递增），供消费方判断处理期间是否有新推送
+        # 最近中间价环形缓冲区（预分配，按推送序号取模写入，不产生新对象），供波动率等指标使用
+        self._mid_history = array.array("d", bytes(8 * self.MID_HISTORY_SIZE))
+        self._update_event: asyncio.Event = asyncio.Event()  # 中间价更新或订单成交时置位，唤醒策略检查循环
+        self._position_closed_event: asyncio.Event = asyncio.Event()  # 持仓为零时置位，用于等待平仓确认
+        self._position_closed_event.set()
+        self._last_full_sync_time: float = 0  # 上次全量同步时间（单调时钟）
         self._sync_interval: float = 30.0  # 订单同步间隔，默认30秒
         self._sync_task: Optional[asyncio.Task] = None  # 同步任务
         self._auth: Optional[StandXAuth] = None  # 保存auth实例用于查询
-        self._last_message_time: float = 0  # 最后收到消息的时间
+        self._last_message_time: float = 0  # 最后收到消息的时间（单调时钟）
         self._health_check_task: Optional[asyncio.Task] = None  # 健康检查任务
         self._reconnecting: bool = False  # 重连标志
+        self._market_disconnected_event: asyncio.Event = asyncio.Event()  # 行情流接收循环退出时置位，立即唤醒健康检查
+        self._order_stream_lock: asyncio.Lock = asyncio.Lock()  # 串行化订单流重连，避免并发下单时重复建连
+        self._login_event: asyncio.Event = asyncio.Event()  # 订单流登录成功响应到达时置位
+        self._cancel_resync_lock: asyncio.Lock = asyncio.Lock()  # 撤单被拒时的订单对账，同一时间只跑一次
         self._symbol = symbol
         self._depth_levels = depth_levels  # 用于深度加权计算的档数（默认5档）
         self._midprice_method = midprice_method  # 中间价计算方式: "simple", "vwa", "vwap"
@@ -51,6 +79,12 @@ class StandXAdapter:
         self.notifier = None
         self.account_name = None
 
+    def _new_market_stream(self) -> StandXMarketStream:
+        """创建行情流对象，并在连接断开时唤醒健康检查循环"""
+        stream = StandXMarketStream()
+        stream.on_disconnect = self._market_disconnected_event.set
+        return stream
+
     async def connect_market_stream(self) -> StandXMarketStream:
         """
         连接市场 WebSocket（公共频道无需认证）
@@ -58,7 +92,7 @@ class StandXAdapter:
             StandXMarketStream: 已连接的市场数据流对象
         """
         if not self._market_stream:
-            self._market_stream = StandXMarketStream()
+            self._market_stream = self._new_market_stream()
         if not self._market_stream.connected:
             await self._market_stream.connect()
 
@@ -73,63 +107,107 @@ class StandXAdapter:
         await self.connect_market_stream()
         await self._market_stream.subscribe(channel, symbol, callback=callback)
 
-    async def on_depth_book(self, data):
+    def on_depth_book(self, data):
+        """
+        处理 depth_book 推送（同步回调：不含 await，由行情流接收任务直接调用）
+        Args:
+            data (dict): 推送消息
+        """
         try:
-            self._last_message_time = time.time()  # 更新心跳时间
-            self.logger.debug("收到 depth_book 数据: %s", data)
+            now = time.monotonic()  # 每次推送只读一次单调时钟（不受系统校时影响），心跳/盘口/价格时间戳共用
+            self._last_message_time = now  # 更新心跳时间
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("收到 depth_book 数据: %s", data)
             if data.get("channel") == "depth_book" and data.get("symbol") == self._symbol:
                 depth_book_data = data.get("data", {})
                 bids = depth_book_data.get("bids") or []
                 asks = depth_book_data.get("asks") or []
 
+                # 每档只解析一次为 (price, qty) 浮点元组，下游计算不再重复 float()
+                # 列表推导比生成器少一层调用；按下标取字段，档位带额外字段时也能解析
                 # 本地排序，bids从高到低，asks从低到高
-                bids = sorted(bids, key=lambda x: float(x[0]), reverse=True)
-                asks = sorted(asks, key=lambda x: float(x[0]))
+                bids = sorted([(float(level[0]), float(level[1])) for level in bids], reverse=True)
+                asks = sorted([(float(level[0]), float(level[1])) for level in asks])
                 
                 # 保存完整的盘口数据（用于风险计算）
                 self._depth_book_data = {
                     "bids": bids,
                     "asks": asks,
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
 
                 # 计算中间价（使用配置的方式）
                 mid_price = self._calculate_midprice(bids, asks)
 
                 if mid_price is not None:
-                    time_diff = 0.0
-                    if self._last_price_update_time is not None:
-                        # 计算新价格距离上次价格更新的时间间隔
-                        time_diff = time.time() - self._last_price_update_time
+                    # 每次推送都会走到这里，日志级别高于 INFO 时跳过日志参数的计算
+                    if self.logger.isEnabledFor(logging.INFO):
+                        time_diff = 0.0
+                        if self._last_price_update_time is not None:
+                            # 计算新价格距离上次价格更新的时间间隔
+                            time_diff = now - self._last_price_update_time
 
-                    if mid_price == self._depth_mid_price:
-                        self.logger.info(
-                            "Depth book 中间价未变(%s): %.4f, 距上次更新 %.2f 秒",
-                            self._midprice_method.upper(),
-                            mid_price,
-                            time_diff,
-                        )
-                    else:
-                        self._depth_mid_price = mid_price
                         self.logger.info(
-                            "Depth book 中间价更新(%s): %.4f, 距上次更新 %.2f 秒",
+                            "Depth book 中间价%s(%s): %.4f, 距上次更新 %.2f 秒",
+                            "未变" if mid_price == self._depth_mid_price else "更新",
                             self._midprice_method.upper(),
                             mid_price,
                             time_diff,
                         )
-                    self._last_price_update_time = time.time()
-                    self._price_updated_and_processed = False
-                    self._price_event.set()  # 设置事件，通知等待者有新价格
+                    self._update_mid_price(mid_price, now)
         except Exception as e:
             self.logger.exception("处理 depth_book 数据失败: %s", e)
 
+    def _update_mid_price(self, mid_price: float, now: float):
+        """
+        写入最新中间价并通知等待者（WS 推送与 HTTP 兜底共用）
+        Args:
+            mid_price (float): 中间价
+            now (float): 单调时钟时间戳
+        """
+        # 中间价未变时挂单偏离也不会变，保持已处理标记，跳过重复的偏离检查
+        if mid_price != self._depth_mid_price:
+            self._price_updated_and_processed = False
+        self._depth_mid_price = mid_price
+        self._last_price_update_time = now
+        self._price_seq += 1
+        self._mid_history[self._price_seq & (self.MID_HISTORY_SIZE - 1)] = mid_price
+        self._price_event.set()  # 设置事件，通知等待者有新价格（重挂等待的是推送新鲜度）
+        self._update_event.set()
+
+    async def refresh_mid_price_from_rest(self) -> bool:
+        """
+        行情推送中断时用 HTTP 查询中间价兜底（推送正常时不查询）
+        Returns:
+            bool: 是否更新了中间价
+        """
+        if not self._auth or time.monotonic() - self._last_message_time < self.PRICE_STALE_THRESHOLD:
+            return False
+        try:
+            result = await asyncio.wait_for(
+                query_symbol_price(self._auth, self._symbol),
+                timeout=self.ORDER_SYNC_TIMEOUT,
+            )
+            # 只用盘口中间价：挂单按中间价定价，mark_price 不是同一口径
+            price = result.get("mid_price")
+            if not price:
+                return False
+            mid_price = float(price)
+        except Exception as e:
+            self.logger.warning("HTTP 查询中间价失败: %s", e)
+            return False
+        
+        self.logger.warning("行情推送中断，使用 HTTP 中间价: %.4f", mid_price)
+        self._update_mid_price(mid_price, time.monotonic())
+        return True
+
     async def subscribe_depth_book(self):
         """
         订阅深度数据频道
         Args:
         """
         if not self._market_stream:
-            self._market_stream = StandXMarketStream()
+            self._market_stream = self._new_market_stream()
         if not self._market_stream.connected:
             await self._market_stream.connect()
         if not self._market_stream.authenticated:
@@ -152,14 +230,58 @@ class StandXAdapter:
         """
         return self._depth_mid_price
     
+    def get_price_seq(self) -> int:
+        """
+        获取中间价推送序号
+        Returns:
+            int: 已收到的中间价推送次数（单调递增）
+        """
+        return self._price_seq
+    
+    def get_recent_mid_prices(self, n: int) -> list[float]:
+        """
+        获取最近 n 次中间价推送（不超过环形缓冲区容量）
+        Args:
+            n (int): 需要的样本数
+        Returns:
+            list[float]: 按时间从旧到新排列的中间价
+        """
+        n = min(n, self._price_seq, self.MID_HISTORY_SIZE)
+        if n <= 0:
+            return []
+        end = (self._price_seq & (self.MID_HISTORY_SIZE - 1)) + 1
+        start = end - n
+        if start >= 0:
+            return self._mid_history[start:end].tolist()
+        # 跨越缓冲区末尾：先取尾部较旧的部分，再取头部较新的部分
+        return self._mid_history[start:].tolist() + self._mid_history[:end].tolist()
+    
     def get_depth_book_data(self) -> Optional[dict]:
         """
         获取完整的盘口数据（用于风险分析）
         Returns:
-            Optional[dict]: 包含 bids, asks, timestamp 的字典
+            Optional[dict]: 包含 bids, asks, timestamp（time.monotonic() 单调时钟）的字典
         """
         return self._depth_book_data
 
+    @staticmethod
+    def _volume_weighted_side(levels: list) -> tuple[float, float]:
+        """
+        计算单侧若干档的成交量加权价格（VWA/VWAP 两种中间价共用）
+        
+        Args:
+            levels: 档位列表 [(price, volume)]（已解析为浮点，非空）
+            
+        Returns:
+            (加权价格, 总成交量)，总量为 0 时加权价格取第一档价格
+        """
+        # 一次拆出价格与数量两列，乘加在 C 层完成，不再逐档执行 Python 表达式
+        prices, volumes = zip(*levels)
+        total_volume = sum(volumes)
+        if total_volume > 0:
+            return sum(map(operator.mul, prices, volumes)) / total_volume, total_volume
+        return prices[0], total_volume
+
     def _calculate_vwa_midprice(self, bids: list, asks: list) -> Optional[float]:
         """
         计算体积加权平均中间价 (VWA - Volume Weighted Average)
@@ -173,8 +295,8 @@ class StandXAdapter:
         优点：反映订单簿实际流动性分布，深度大的价格级别影响更大
         
         Args:
-            bids: 买单列表 [price, volume]
-            asks: 卖单列表 [price, volume]
+            bids: 买单列表 [(price, volume)]（已解析为浮点）
+            asks: 卖单列表 [(price, volume)]（已解析为浮点）
             
         Returns:
             体积加权中间价，若数据不足返回None
@@ -190,23 +312,9 @@ class StandXAdapter:
             if not bid_levels or not ask_levels:
                 return None
             
-            # 计算加权买价
-            total_bid_volume = sum(float(level[1]) for level in bid_levels)
-            if total_bid_volume > 0:
-                weighted_bid = sum(
-                    float(level[0]) * float(level[1]) for level in bid_levels
-                ) / total_bid_volume
-            else:
-                weighted_bid = float(bid_levels[0][0])
-            
-            # 计算加权卖价
-            total_ask_volume = sum(float(level[1]) for level in ask_levels)
-            if total_ask_volume > 0:
-                weighted_ask = sum(
-                    float(level[0]) * float(level[1]) for level in ask_levels
-                ) / total_ask_volume
-            else:
-                weighted_ask = float(ask_levels[0][0])
+            # 计算加权买价 / 加权卖价
+            weighted_bid, total_bid_volume = self._volume_weighted_side(bid_levels)
+            weighted_ask, total_ask_volume = self._volume_weighted_side(ask_levels)
             
             # 中间价
             vwa_mid_price = (weighted_bid + weighted_ask) / 2
@@ -234,8 +342,8 @@ class StandXAdapter:
         优点：反映整个订单簿的压力，对市场流动性极度不对称敏感
         
         Args:
-            bids: 买单列表 [price, volume]
-            asks: 卖单列表 [price, volume]
+            bids: 买单列表 [(price, volume)]（已解析为浮点）
+            asks: 卖单列表 [(price, volume)]（已解析为浮点）
             
         Returns:
             VWAP中间价，若数据不足返回None
@@ -251,21 +359,9 @@ class StandXAdapter:
             if not bid_levels or not ask_levels:
                 return None
             
-            # 计算买侧流动性加权价格
-            total_bid_volume = sum(float(level[1]) for level in bid_levels)
-            bid_vwap = (
-                sum(float(level[0]) * float(level[1]) for level in bid_levels) / total_bid_volume
-                if total_bid_volume > 0
-                else float(bid_levels[0][0])
-            )
-            
-            # 计算卖侧流动性加权价格
-            total_ask_volume = sum(float(level[1]) for level in ask_levels)
-            ask_vwap = (
-                sum(float(level[0]) * float(level[1]) for level in ask_levels) / total_ask_volume
-                if total_ask_volume > 0
-                else float(ask_levels[0][0])
-            )
+            # 计算买侧 / 卖侧流动性加权价格
+            bid_vwap, total_bid_volume = self._volume_weighted_side(bid_levels)
+            ask_vwap, total_ask_volume = self._volume_weighted_side(ask_levels)
             
             # VWAP中间价：按流动性比例加权
             total_volume = total_bid_volume + total_ask_volume
@@ -298,8 +394,8 @@ class StandXAdapter:
         Returns:
             简单中间价
         """
-        best_bid = float(bids[0][0]) if bids else None
-        best_ask = float(asks[0][0]) if asks else None
+        best_bid = bids[0][0] if bids else None
+        best_ask = asks[0][0] if asks else None
         
         if best_bid is not None and best_ask is not None:
             return (best_bid + best_ask) / 2
@@ -358,11 +454,14 @@ class StandXAdapter:
                     order_data.get("fill_avg_price"),
                 )
                 
+                if order_status in ["filled", "partially_filled"]:
+                    self._fill_count += 1
+                    self._update_event.set()  # 成交后立即唤醒策略检查补单，不必等下一次价格推送
+                
                 # 增量更新逻辑
                 if order_status in ["canceled", "filled"]:
                     # 已完成的订单，从缓存中移除
-                    if order_id in self._orders_dict:
-                        del self._orders_dict[order_id]
+                    if self._remove_order(order_id) is not None:
                         self.logger.info("订单已完成，移除 id=%s", order_id)
                     else:
                         self.logger.debug("收到已完成订单但本地不存在 id=%s", order_id)
@@ -374,7 +473,9 @@ class StandXAdapter:
                         self.logger.info("新增订单 id=%s", order_id)
                         self._order_confirmed_count += 1
                     
-                    self._orders_dict[order_id] = order_data
+                    self._store_order(order_data)
+                
+                self._order_event.set()  # 唤醒等待订单确认的协程
                 
                 # 检测订单总数是否超过2
                 self.logger.info("当前订单总数: %d", len(self._orders_dict))
@@ -383,6 +484,47 @@ class StandXAdapter:
         except Exception as e:
             self.logger.exception("处理 order 数据失败: %s", e)
 
+    def _store_order(self, order: dict):
+        """
+        写入订单缓存（同时维护按方向索引），并预先解析数值价格到 price_f
+        Args:
+            order (dict): 订单数据
+        """
+        # WS 推送与 REST 同步都经过这里，价格只解析一次，供偏离检查直接使用
+        try:
+            order["price_f"] = float(order.get("price") or 0)
+        except (TypeError, ValueError):
+            order["price_f"] = 0.0
+        order_id = order.get("id")
+        self._orders_dict[order_id] = order
+        side_orders = self._orders_by_side.get(order.get("side"))
+        if side_orders is not None:
+            side_orders[order_id] = order
+
+    def _remove_order(self, order_id) -> Optional[dict]:
+        """
+        从订单缓存移除订单（同时维护按方向索引）
+        Args:
+            order_id: 订单ID
+        Returns:
+            Optional[dict]: 被移除的订单，不存在时为 None
+        """
+        order = self._orders_dict.pop(order_id, None)
+        if order is not None:
+            self._orders_by_side.get(order.get("side"), {}).pop(order_id, None)
+        return order
+
+    def _reset_orders(self, orders: list):
+        """
+        用全量订单列表替换本地缓存
+        Args:
+            orders (list): 订单列表
+        """
+        self._orders_dict = {}
+        self._orders_by_side = {"buy": {}, "sell": {}}
+        for order in orders:
+            self._store_order(order)
+
     async def _check_order_count_exceeded(self):
         """
         检测订单总数是否超过2，如果超过则发送通知
@@ -391,7 +533,7 @@ class StandXAdapter:
         if self._last_order_count <= 2 and current_count > 2:
             # 从 <= 2 变到 > 2，发送通知
             if self.notifier:
-                await self.notifier.send(
+                self.notifier.send_nowait(
                     f"⚠️ *订单总数超过2*\n"
                     f"账户: `{self.account_name}`\n"
                     f"订单总数: {current_count}\n"
@@ -429,7 +571,7 @@ class StandXAdapter:
                 if self._last_position_qty == 0 and current_qty != 0:
                     direction = "多头" if current_qty > 0 else "空头"
                     if self.notifier:
-                        await self.notifier.send(
+                        self.notifier.send_nowait(
                             f"*新增持仓*\n"
                             f"账户: `{self.account_name}`\n"
                             f"交易对: `{symbol}`\n"
@@ -440,7 +582,7 @@ class StandXAdapter:
                 # 从有持仓变为无持仓
                 elif self._last_position_qty != 0 and current_qty == 0:
                     if self.notifier:
-                        await self.notifier.send(
+                        self.notifier.send_nowait(
                             f"*持仓已清*\n"
                             f"账户: `{self.account_name}`\n"
                             f"交易对: `{symbol}`\n"
@@ -448,10 +590,29 @@ class StandXAdapter:
                         )
                 
                 self._last_position_qty = current_qty
+                pos_data["qty_f"] = current_qty  # 数量只解析一次，持仓监控等读取方直接使用
                 self._position = pos_data
+                self._mark_position_updated()
+                if symbol == self._symbol:
+                    self._update_position_closed_event(current_qty)
         except Exception as e:
             self.logger.exception("处理 position 数据失败: %s", e)
 
+    def _mark_position_updated(self):
+        """持仓缓存刚被推送或同步刷新，唤醒等待持仓变化的协程"""
+        self._position_update_event.set()
+
+    def _update_position_closed_event(self, qty: float):
+        """
+        根据最新持仓数量更新平仓事件
+        Args:
+            qty (float): 当前持仓数量
+        """
+        if abs(qty) <= self.POSITION_QTY_EPSILON:
+            self._position_closed_event.set()
+        else:
+            self._position_closed_event.clear()
+
     async def _authenticate_and_subscribe(self):
         """
         认证并订阅订单和持仓频道
@@ -469,23 +630,29 @@ class StandXAdapter:
         await self._market_stream.subscribe("position", callback=self.on_position)
 
     async def _initial_sync_with_timeout(self):
-        """初始同步订单（带超时保护，防止阻塞价格获取）"""
+        """初始同步订单与持仓（带超时保护，防止阻塞价格获取）"""
         try:
             # 最多等待3秒完成初始同步，超时继续运行，由定期同步补偿
+            # 持仓同步一次填充缓存，之后只随 position 推送更新，热路径不再查询
             await asyncio.wait_for(
-                self._sync_orders_from_server(),
+                asyncio.gather(
+                    self._sync_orders_from_server(),
+                    self._sync_positions_from_server(),
+                ),
                 timeout=3.0
             )
         except asyncio.TimeoutError:
-            self.logger.warning("初始订单同步超时（3秒），继续运行，将由定期同步补偿")
+            self.logger.warning("初始订单/持仓同步超时（3秒），继续运行，将由定期同步补偿")
         except Exception as e:
-            self.logger.exception("初始订单同步失败: %s", e)
+            self.logger.exception("初始订单/持仓同步失败: %s", e)
 
-    async def _sync_orders_from_server(self):
-        """从服务器全量同步订单状态（使用HTTP API，带超时）"""
+    async def _sync_orders_from_server(self) -> bool:
+        """
+        从服务器全量同步订单状态（使用HTTP API，带超时）
+        Returns:
+            bool: 是否发现孤儿订单（本地有但服务器无，可能是漏推送的成交）
+        """
         try:
-            from standx_api import query_open_orders
-            
             self.logger.info("开始全量同步订单状态...")
             # 查询API使用配置的超时时间，防止阻塞
             try:
@@ -495,14 +662,11 @@ class StandXAdapter:
                 )
             except asyncio.TimeoutError:
                 self.logger.warning("查询开仓订单API超时（%.0f秒），本次同步跳过", self.ORDER_SYNC_TIMEOUT)
-                return
+                return False
             
             server_orders = result.get("result", [])
             server_order_ids = {order["id"] for order in server_orders}
             
-            # 更新本地缓存为字典格式
-            new_orders_dict = {order["id"]: order for order in server_orders}
-            
             # 检测本地多余的订单（孤儿订单）
             local_order_ids = set(self._orders_dict.keys())
             orphaned_ids = local_order_ids - server_order_ids
@@ -510,7 +674,7 @@ class StandXAdapter:
             if orphaned_ids:
                 self.logger.warning("检测到孤儿订单（本地有但服务器无）: %s", orphaned_ids)
                 if self.notifier:
-                    await self.notifier.send(
+                    self.notifier.send_nowait(
                         f"⚠️ *检测到孤儿订单*\n"
                         f"账户: `{self.account_name}`\n"
                         f"订单ID: {list(orphaned_ids)}\n"
@@ -523,8 +687,9 @@ class StandXAdapter:
                 self.logger.warning("检测到未推送的订单（服务器有但本地无）: %s", new_ids)
             
             # 替换为最新数据
-            self._orders_dict = new_orders_dict
-            self._last_full_sync_time = time.time()
+            self._reset_orders(server_orders)
+            self._order_event.set()
+            self._last_full_sync_time = time.monotonic()
             
             self.logger.info(
                 "订单同步完成: 服务器 %d 个, 本地 %d 个, 孤儿 %d 个, 新增 %d 个",
@@ -533,9 +698,11 @@ class StandXAdapter:
                 len(orphaned_ids),
                 len(new_ids)
             )
+            return bool(orphaned_ids)
             
         except Exception as e:
             self.logger.exception("订单同步失败: %s", e)
+            return False
 
     async def _sync_positions_from_server(self):
         """从服务器同步持仓状态（使用HTTP API，带超时）"""
@@ -560,7 +727,7 @@ class StandXAdapter:
                         break
             
             # 更新本地缓存
-            old_qty = float(self._position.get("qty", 0)) if self._position else 0
+            old_qty = self._position.get("qty_f", 0) if self._position else 0
             new_qty = float(current_position.get("qty", 0)) if current_position else 0
             
             # 检测持仓变化（使用容差比较避免浮点误差）
@@ -571,7 +738,7 @@ class StandXAdapter:
                     new_qty
                 )
                 if self.notifier:
-                    await self.notifier.send(
+                    self.notifier.send_nowait(
                         f"⚠️ *持仓状态已同步*\n"
                         f"账户: `{self.account_name}`\n"
                         f"交易对: `{self._symbol}`\n"
@@ -584,8 +751,11 @@ class StandXAdapter:
             if current_position:
                 # Note: _last_position_qty is used as a baseline for change detection
                 # across both sync (here) and real-time updates (on_position handler)
+                current_position["qty_f"] = new_qty
                 self._position = current_position
+                self._mark_position_updated()
                 self._last_position_qty = new_qty
+                self._update_position_closed_event(new_qty)
                 self.logger.info(
                     "持仓同步完成: symbol=%s, qty=%s, entry_price=%s",
                     current_position.get("symbol"),
@@ -595,7 +765,9 @@ class StandXAdapter:
             else:
                 # Clear both position data and tracking quantity
                 self._position = {}
+                self._mark_position_updated()
                 self._last_position_qty = 0
+                self._update_position_closed_event(0)
                 self.logger.info("持仓同步完成: 无持仓")
             
         except Exception as e:
@@ -608,12 +780,17 @@ class StandXAdapter:
                 await asyncio.sleep(self._sync_interval)
                 # 同步操作最多5秒，超时则跳过此次同步，下次继续尝试
                 try:
-                    await asyncio.wait_for(
+                    fill_suspected = await asyncio.wait_for(
                         self._sync_orders_from_server(),
                         timeout=5.0
                     )
                 except asyncio.TimeoutError:
                     self.logger.warning("定期订单同步超时（5秒），下次继续尝试")
+                    continue
+                
+                # 订单从服务器消失但未收到推送，可能有漏推送的成交，此时才额外同步持仓
+                if fill_suspected:
+                    await self._sync_positions_from_server()
             except asyncio.CancelledError:
                 self.logger.info("订单同步任务已取消")
                 break
@@ -621,30 +798,44 @@ class StandXAdapter:
                 self.logger.exception("订单同步循环异常: %s", e)
 
     async def _health_check_loop(self):
-        """健康检查循环 - 监控WebSocket连接"""
+        """健康检查循环 - 监控WebSocket连接，断线时按指数退避重连"""
         check_interval = 3.0  # 每3秒检查一次
         timeout_threshold = 15.0  # 15秒钟无消息视为超时
+        reconnect_delay = self.RECONNECT_BACKOFF_INITIAL
         
         self.logger.info("健康检查循环已启动，检查间隔: %.0f秒，超时阈值: %.0f秒", check_interval, timeout_threshold)
         
         while True:
             try:
-                await asyncio.sleep(check_interval)
+                if not self._market_stream or self._market_stream.connected:
+                    # 连接正常时按检查间隔巡检；接收循环退出会立即唤醒，不必等到下次巡检
+                    self._market_disconnected_event.clear()
+                    try:
+                        await asyncio.wait_for(self._market_disconnected_event.wait(), timeout=check_interval)
+                    except asyncio.TimeoutError:
+                        pass
                 
                 # 检查market stream连接状态
-                if self._market_stream:
-                    if not self._market_stream.connected:
-                        self.logger.error("检测到market stream断开，准备重连...")
-                        await self._reconnect_market_stream()
-                    elif self._last_message_time > 0:
-                        time_since_last = time.time() - self._last_message_time
-                        if time_since_last > timeout_threshold:
-                            self.logger.error(
-                                f"超过{timeout_threshold}秒未收到消息（上次: {time_since_last:.1f}秒前），准备重连..."
-                            )
-                            await self._reconnect_market_stream()
-                        else:
-                            self.logger.debug("健康检查通过，距上次消息: %.1f秒", time_since_last)
+                if not self._market_stream:
+                    continue
+                if not self._market_stream.connected:
+                    self.logger.error("检测到market stream断开，准备重连...")
+                else:
+                    time_since_last = time.monotonic() - self._last_message_time
+                    if self._last_message_time <= 0 or time_since_last <= timeout_threshold:
+                        self.logger.debug("健康检查通过，距上次消息: %.1f秒", time_since_last)
+                        continue
+                    self.logger.error(
+                        "超过%.0f秒未收到消息（上次: %.1f秒前），准备重连...", timeout_threshold, time_since_last
+                    )
+                
+                if await self._reconnect_market_stream():
+                    reconnect_delay = self.RECONNECT_BACKOFF_INITIAL
+                else:
+                    # 重连失败按指数退避后重试（0.5→1→2→…→10秒），服务端故障期间不频繁建连
+                    self.logger.warning("%.1f秒后重试重连", reconnect_delay)
+                    await asyncio.sleep(reconnect_delay)
+                    reconnect_delay = min(reconnect_delay * 2, self.RECONNECT_BACKOFF_MAX)
                 
             except asyncio.CancelledError:
                 self.logger.info("健康检查任务已取消")
@@ -652,11 +843,15 @@ class StandXAdapter:
             except Exception as e:
                 self.logger.exception("健康检查循环异常: %s", e)
 
-    async def _reconnect_market_stream(self):
-        """重连market stream"""
+    async def _reconnect_market_stream(self) -> bool:
+        """
+        重连market stream
+        Returns:
+            bool: 是否重连成功（已有重连在进行中时返回 True）
+        """
         if self._reconnecting:
             self.logger.info("重连已在进行中，跳过")
-            return
+            return True
         
         self._reconnecting = True
         try:
@@ -667,10 +862,10 @@ class StandXAdapter:
                 try:
                     await self._market_stream.disconnect()
                 except Exception as e:
-                    self.logger.warning(f"关闭旧连接失败: {e}")
+                    self.logger.warning("关闭旧连接失败: %s", e)
             
             # 重新创建并连接
-            self._market_stream = StandXMarketStream()
+            self._market_stream = self._new_market_stream()
             await self._market_stream.connect()
             
             # 重新订阅depth_book
@@ -691,57 +886,61 @@ class StandXAdapter:
                 await self._market_stream.subscribe("position", callback=self.on_position)
                 self.logger.info("已重新认证并订阅order/position")
                 
-                # 重连后同步持仓和订单状态，确保数据一致
+                # 重连后同步持仓和订单状态，确保数据一致（两个查询互不依赖，并发执行）
                 if self._auth:
-                    try:
-                        await asyncio.wait_for(
-                            self._sync_positions_from_server(),
-                            timeout=self.RECONNECT_SYNC_TIMEOUT
-                        )
-                    except asyncio.TimeoutError:
-                        self.logger.warning("重连后持仓同步超时（%.0f秒），跳过本次同步", self.RECONNECT_SYNC_TIMEOUT)
-                    except Exception as e:
-                        self.logger.exception("重连后持仓同步失败: %s", e)
-                    
-                    try:
-                        await asyncio.wait_for(
-                            self._sync_orders_from_server(),
-                            timeout=self.RECONNECT_SYNC_TIMEOUT
-                        )
-                    except asyncio.TimeoutError:
-                        self.logger.warning("重连后订单同步超时（%.0f秒），跳过本次同步", self.RECONNECT_SYNC_TIMEOUT)
-                    except Exception as e:
-                        self.logger.exception("重连后订单同步失败: %s", e)
+                    await asyncio.gather(
+                        self._reconnect_sync(self._sync_positions_from_server(), "持仓"),
+                        self._reconnect_sync(self._sync_orders_from_server(), "订单"),
+                    )
             
-            self._last_message_time = time.time()
+            self._last_message_time = time.monotonic()
             self.logger.info("Market stream重连成功")
             
             # 发送通知
             if self.notifier:
-                await self.notifier.send(
+                self.notifier.send_nowait(
                     f"✅ *WebSocket重连成功*\n"
                     f"账户: `{self.account_name}`\n"
                     f"时间: {time.strftime('%Y-%m-%d %H:%M:%S')}"
                 )
+            return True
             
         except Exception as e:
-            self.logger.exception(f"重连失败: {e}")
+            self.logger.exception("重连失败: %s", e)
             if self.notifier:
-                await self.notifier.send(
+                # 退避重试期间每次失败都会走到这里，通知按分钟限流
+                self.notifier.send_nowait(
                     f"⚠️ *WebSocket重连失败*\n"
                     f"账户: `{self.account_name}`\n"
-                    f"错误: {e}"
+                    f"错误: {e}",
+                    throttle_key="ws_reconnect_failed",
+                    throttle_seconds=60,
                 )
+            return False
         finally:
             self._reconnecting = False
 
+    async def _reconnect_sync(self, sync_coro, label: str):
+        """
+        重连后的单项状态同步（带超时保护，失败只记录日志）
+        Args:
+            sync_coro: 同步协程
+            label (str): 日志中的同步项名称
+        """
+        try:
+            await asyncio.wait_for(sync_coro, timeout=self.RECONNECT_SYNC_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning("重连后%s同步超时（%.0f秒），跳过本次同步", label, self.RECONNECT_SYNC_TIMEOUT)
+        except Exception as e:
+            self.logger.exception("重连后%s同步失败: %s", label, e)
+
     def get_buy_order_count(self) -> int:
         """
         获取买单数量
         Returns:
             int: 买单数量
         """
-        return sum(1 for order in self._orders_dict.values() if order["side"] == "buy")
+        return len(self._orders_by_side["buy"])
 
     def get_sell_order_count(self) -> int:
         """
@@ -749,7 +948,7 @@ class StandXAdapter:
         Returns:
             int: 卖单数量
         """
-        return sum(1 for order in self._orders_dict.values() if order["side"] == "sell")
+        return len(self._orders_by_side["sell"])
 
     def get_buy_orders(self) -> list:
         """
@@ -757,7 +956,7 @@ class StandXAdapter:
         Returns:
             list: 买单列表
         """
-        return [order for order in self._orders_dict.values() if order["side"] == "buy"]
+        return list(self._orders_by_side["buy"].values())
 
     def get_sell_orders(self) -> list:
         """
@@ -765,7 +964,33 @@ class StandXAdapter:
         Returns:
             list: 卖单列表
         """
-        return [order for order in self._orders_dict.values() if order["side"] == "sell"]
+        return list(self._orders_by_side["sell"].values())
+
+    def get_first_order(self, side: str) -> Optional[dict]:
+        """
+        获取指定方向最早缓存的一笔订单（不复制整个列表，供热路径读取）
+        Args:
+            side (str): "buy" 或 "sell"
+        Returns:
+            Optional[dict]: 订单数据，无订单时为 None
+        """
+        return next(iter(self._orders_by_side[side].values()), None)
+
+    def get_fill_count(self) -> int:
+        """
+        获取累计成交推送次数
+        Returns:
+            int: 成交推送次数（单调递增）
+        """
+        return self._fill_count
+
+    def get_order_ack_counts(self) -> tuple[int, int]:
+        """
+        获取累计订单确认与被拒次数
+        Returns:
+            tuple[int, int]: (确认次数, 被拒次数)，均单调递增，可作为 wait_for_orders 的起点
+        """
+        return self._order_confirmed_count, self._order_rejected_count
 
     async def get_position(self, symbol: Optional[str] = None) -> list:
         """
@@ -773,7 +998,7 @@ class StandXAdapter:
         Args:
             symbol (Optional[str]): 交易对占位参数（当前实现未使用）
         Returns:
-            dict: 最新持仓信息，未收到推送时为 {}
+            dict: 最新持仓信息（含已解析的浮点数量 qty_f），未收到推送时为 {}
         """
         return self._position
 
@@ -791,28 +1016,54 @@ class StandXAdapter:
         """
         self._price_updated_and_processed = True
 
-    async def wait_for_orders(self, count: int = 2, timeout: float = 5.0) -> bool:
+    async def wait_for_orders(
+        self, count: int = 2, timeout: float = 5.0, since: Optional[tuple[int, int]] = None
+    ) -> bool:
         """
         等待指定数量的新订单确认（通过WebSocket回调）
+        有下单请求被拒时提前返回，不必等到超时
         Args:
             count: 等待的订单数量
             timeout: 超时时间（秒）
+            since: 计数起点（下单前通过 get_order_ack_counts 获取），
+                为 None 时从当前计数开始，下单期间已到达的确认会被漏计
         Returns:
             bool: 是否在超时前收到所有订单确认
         """
-        initial_count = self._order_confirmed_count
+        initial_count, initial_rejected = self.get_order_ack_counts() if since is None else since
         target_count = initial_count + count
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self._order_confirmed_count >= target_count:
-                self.logger.info(
-                    "订单确认完成: 已确认 %d 个订单，耗时 %.2f 秒",
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + timeout
+        while self._order_confirmed_count < target_count:
+            rejected = self._order_rejected_count - initial_rejected
+            if rejected > 0 and (self._order_confirmed_count - initial_count) + rejected >= count:
+                # 所有下单请求都已有结果，其中有被拒的，不会再收到更多确认
+                self.logger.warning(
+                    "订单确认提前结束: 期望 %d 个，确认 %d 个，被拒 %d 个",
                     count,
-                    time.time() - start_time,
+                    self._order_confirmed_count - initial_count,
+                    rejected,
                 )
-                return True
-            await asyncio.sleep(0.05)  # 50ms检查一次
+                return False
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # 等待下一次订单推送，而不是固定间隔轮询
+            self._order_event.clear()
+            try:
+                await asyncio.wait_for(self._order_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+
+        if self._order_confirmed_count >= target_count:
+            self.logger.info(
+                "订单确认完成: 已确认 %d 个订单，耗时 %.2f 秒",
+                count,
+                loop.time() - start_time,
+            )
+            return True
 
         self.logger.warning(
             "订单确认超时: 期望 %d 个，实际收到 %d 个，耗时 %.2f 秒",
@@ -834,8 +1085,10 @@ class StandXAdapter:
         Returns:
             bool: 是否在超时前达到目标
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + timeout
+        while True:
             if (
                 self.get_buy_order_count() == target_buy
                 and self.get_sell_order_count() == target_sell
@@ -844,10 +1097,18 @@ class StandXAdapter:
                     "订单数量达到目标: 买单 %d, 卖单 %d，耗时 %.2f 秒",
                     target_buy,
                     target_sell,
-                    time.time() - start_time,
+                    loop.time() - start_time,
                 )
                 return True
-            await asyncio.sleep(0.05)  # 50ms检查一次
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # 等待下一次订单推送再检查，而不是固定 50ms 轮询
+            self._order_event.clear()
+            try:
+                await asyncio.wait_for(self._order_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
 
         self.logger.warning(
             "等待订单数量超时: 目标(买%d/卖%d), 实际(买%d/卖%d), 耗时 %.2f 秒",
@@ -876,29 +1137,133 @@ class StandXAdapter:
             self.logger.warning("等待新价格超时 (%.1f秒)，取消下单", timeout)
             return False
 
+    async def wait_for_position_update(self, timeout: float) -> bool:
+        """
+        等待持仓推送或持仓同步（持仓监控循环使用）
+        Args:
+            timeout: 超时时间（秒）
+        Returns:
+            bool: 是否在超时前有持仓更新
+        """
+        self._position_update_event.clear()
+        try:
+            await asyncio.wait_for(self._position_update_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_update(self, timeout: float) -> bool:
+        """
+        等待中间价更新或订单成交（策略检查循环使用）
+        Args:
+            timeout: 超时时间（秒）
+        Returns:
+            bool: 是否在超时前有更新
+        """
+        self._update_event.clear()
+        try:
+            await asyncio.wait_for(self._update_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_mid_price(self, timeout: float = 5.0) -> bool:
+        """
+        等待中间价就绪（已有中间价时立即返回，用于启动时等待首次 depth_book 推送）
+        Args:
+            timeout: 超时时间（秒）
+        Returns:
+            bool: 中间价是否已就绪
+        """
+        if self._depth_mid_price is not None:
+            return True
+        self._price_event.clear()
+        try:
+            await asyncio.wait_for(self._price_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._depth_mid_price is not None
+
+    async def wait_for_position_closed(self, timeout: float = POSITION_CLOSE_TIMEOUT) -> bool:
+        """
+        等待持仓归零（由 position 频道推送触发）
+        推送未及时到达时按指数退避间隔用 HTTP 查询持仓兜底
+        Args:
+            timeout: 超时时间（秒）
+        Returns:
+            bool: 持仓是否已归零
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = self.POSITION_CLOSE_POLL_INITIAL
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(
+                    self._position_closed_event.wait(), timeout=min(delay, remaining)
+                )
+                return True
+            except asyncio.TimeoutError:
+                pass
+
+            # 推送可能丢失，用一次 HTTP 查询确认
+            if self._auth:
+                self.logger.info("%.1f秒内未收到平仓推送，改用HTTP查询持仓", delay)
+                await self._sync_positions_from_server()
+                if self._position_closed_event.is_set():
+                    return True
+            delay = min(delay * 2, self.POSITION_CLOSE_POLL_MAX)
+
+        self.logger.warning("等待平仓确认超时 (%.1f秒)", timeout)
+        return self._position_closed_event.is_set()
+
     def on_login(self, data):
         """
-        处理登录成功回调
+        处理登录响应回调
         Args:
-            data (dict): 登录成功数据
+            data (dict): 登录响应数据
         """
+        code = data.get("code", 0)
+        if code not in (0, None):
+            self.logger.warning("WebSocket 登录失败: %s", data)
+            return
         self.logger.info("WebSocket 登录成功: %s", data)
+        self._login_event.set()
 
     def on_new_order(self, data):
         """
-        处理新订单回调
+        处理新订单回调（order:new 响应）
         Args:
             data (dict): 新订单数据
         """
+        code = data.get("code", 0)
+        if code not in (0, None):
+            self.logger.warning("通过订单流下单被拒: %s", data)
+            self._order_rejected_count += 1
+            self._order_event.set()  # 唤醒等待订单确认的协程
+            return
         self.logger.info("通过订单流下单成功: %s", data)
 
-    def on_cancel_order(self, data):
+    async def on_cancel_order(self, data):
         """
         处理取消订单回调
+        撤单被拒（通常是订单已成交或已撤销）时不会再有订单推送，
+        立即用 HTTP 对账订单缓存，让等待撤单完成的协程及时返回而不是等到超时
         Args:
             data (dict): 取消订单数据
         """
-        self.logger.info("通过订单流取消订单成功: %s", data)
+        code = data.get("code", 0)
+        if code in (0, None):
+            self.logger.info("通过订单流取消订单成功: %s", data)
+            return
+        
+        self.logger.warning("通过订单流撤单被拒: %s", data)
+        if not self._auth or self._cancel_resync_lock.locked():
+            return  # 同一批撤单只需对账一次
+        async with self._cancel_resync_lock:
+            await self._sync_orders_from_server()
 
     async def connect_order_stream(self, auth):
         """
@@ -918,9 +1283,15 @@ class StandXAdapter:
         if not os.getenv("ACCESS_TOKEN"):
             raise ValueError("环境变量 ACCESS_TOKEN 未设置")
 
+        self._login_event.clear()
         await self._order_stream.login(
             token=os.getenv("ACCESS_TOKEN"), callback=self.on_login
         )
+        # 等待登录响应再返回：重连后的下单/撤单重试不会在登录完成前发出而被拒
+        try:
+            await asyncio.wait_for(self._login_event.wait(), timeout=self.LOGIN_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning("%.0f秒内未收到订单流登录响应，继续运行", self.LOGIN_ACK_TIMEOUT)
         
         # ✨ 改进：初始同步改为后台任务（带超时保护），不阻塞主流程，避免延迟价格获取
         asyncio.create_task(self._initial_sync_with_timeout())
@@ -929,6 +1300,14 @@ class StandXAdapter:
         if not self._sync_task or self._sync_task.done():
             self._sync_task = asyncio.create_task(self._periodic_sync_loop())
 
+    def is_order_stream_connected(self) -> bool:
+        """
+        订单流是否处于连接状态
+        Returns:
+            bool: 是否已连接
+        """
+        return bool(self._order_stream and self._order_stream.connected)
+
     async def _ensure_order_stream_connected(self):
         """确保订单流已连接，未连接时尝试重连"""
         if self._order_stream and self._order_stream.connected:
@@ -936,8 +1315,12 @@ class StandXAdapter:
         if not self._auth:
             raise RuntimeError("订单流未连接且缺少认证信息")
 
-        self.logger.warning("订单流未连接，尝试重连...")
-        await self.connect_order_stream(self._auth)
+        async with self._order_stream_lock:
+            # 等锁期间可能已被其他协程重连
+            if self._order_stream and self._order_stream.connected:
+                return
+            self.logger.warning("订单流未连接，尝试重连...")
+            await self.connect_order_stream(self._auth)
 
     async def new_order(
         self,
@@ -967,7 +1350,7 @@ class StandXAdapter:
             dict: 下单结果
         """
         max_retries = 3
-        retry_delay = 1.0  # 重试间隔（秒）
+        retry_delay = self.ORDER_RETRY_DELAY_INITIAL  # 重试间隔（秒），每次失败后翻倍
         
         for attempt in range(max_retries):
             try:
@@ -1000,7 +1383,7 @@ class StandXAdapter:
                 
                 if is_connection_error and attempt < max_retries - 1:
                     self.logger.warning(
-                        "下单失败(连接断开)，%d秒后重试 (%d/%d): %s",
+                        "下单失败(连接断开)，%.1f秒后重连重试 (%d/%d): %s",
                         retry_delay,
                         attempt + 1,
                         max_retries,
@@ -1009,7 +1392,9 @@ class StandXAdapter:
                     # 标记连接断开，下次循环会触发重连
                     if self._order_stream:
                         self._order_stream.connected = False
+                    # 服务器 going away 期间立即重连多半同样失败，退避后再试
                     await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
                     continue
                 else:
                     # 非连接错误或已达最大重试次数，抛出异常
@@ -1021,12 +1406,16 @@ class StandXAdapter:
         Args:
             symbol (str): 交易对
         """
+        # 平仓只在退出时调用，此时持仓推送可能已中断：先用一次 HTTP 查询校准缓存，
+        # 之后的平仓确认仍由 position 推送事件驱动
+        if self._auth and symbol == self._symbol:
+            await self._sync_positions_from_server()
         position = await self.get_position(symbol)
 
         if not position:
             return
 
-        qty_value = float(position.get("qty", 0))
+        qty_value = position.get("qty_f", 0)
         if qty_value == 0:
             return
 
@@ -1041,6 +1430,7 @@ class StandXAdapter:
         )
 
         try:
+            self._position_closed_event.clear()
             await self.new_order(
                 symbol=symbol,
                 side=side,
@@ -1048,10 +1438,13 @@ class StandXAdapter:
                 qty=qty,
                 reduce_only=True,
             )
-            
+
+            if not await self.wait_for_position_closed():
+                raise RuntimeError(f"平仓未确认，剩余持仓: {self._position.get('qty')}")
+
             # 平仓成功发送通知
             if self.notifier:
-                await self.notifier.send(
+                self.notifier.send_nowait(
                     f"*持仓平仓*\n"
                     f"账户: `{self.account_name}`\n"
                     f"交易对: `{symbol}`\n"
@@ -1062,7 +1455,7 @@ class StandXAdapter:
             self.logger.exception("平仓失败: %s", e)
             # 平仓失败发送通知
             if self.notifier:
-                await self.notifier.send(
+                self.notifier.send_nowait(
                     f"*平仓失败*\n"
                     f"账户: `{self.account_name}`\n"
                     f"交易对: `{symbol}`\n"
@@ -1071,57 +1464,100 @@ class StandXAdapter:
 
     async def cancel_all_orders(self, symbol: Optional[str] = None):
         """
-        取消所有未完成订单（带重连重试机制）
+        取消所有未完成订单（各订单并发发送，带重连重试机制）
         Args:
             symbol (Optional[str]): 交易对，若提供则只取消该交易对的订单
         """
-        max_retries = 3
-        retry_delay = 1.0
-
         orders_to_cancel = (
             [order for order in self._orders_dict.values() if order["symbol"] == symbol]
             if symbol
             else list(self._orders_dict.values())
         )
 
-        for order in orders_to_cancel:
-            for attempt in range(max_retries):
-                try:
-                    await self._ensure_order_stream_connected()
-                    
-                    await self._order_stream.cancel_order(
-                        order_id=order["id"],
-                        cl_ord_id=order["cl_ord_id"],
-                        callback=self.on_cancel_order,
+        # 各订单撤单互不依赖，并发发送以重叠等待时间
+        await asyncio.gather(
+            *(self._cancel_order_with_retry(order) for order in orders_to_cancel)
+        )
+
+    async def cancel_all_orders_bulk(self, symbol: Optional[str] = None, include_server: bool = False):
+        """
+        通过 HTTP 批量撤单接口一次取消所有订单，失败时退回订单流逐单取消
+        Args:
+            symbol (Optional[str]): 交易对，若提供则只取消该交易对的订单
+            include_server (bool): 是否先查询服务器挂单并一并取消（覆盖本地缓存缺失的订单，用于退出清理）
+        """
+        order_ids = {
+            order["id"]
+            for order in self._orders_dict.values()
+            if not symbol or order["symbol"] == symbol
+        }
+        if include_server and self._auth:
+            try:
+                result = await asyncio.wait_for(
+                    query_open_orders(self._auth, symbol=symbol),
+                    timeout=self.ORDER_SYNC_TIMEOUT,
+                )
+                order_ids.update(order["id"] for order in result.get("result", []))
+            except Exception as e:
+                self.logger.warning("查询服务器挂单失败，仅取消本地缓存订单: %s", e)
+        if not order_ids:
+            return
+        if self._auth:
+            try:
+                await cancel_orders(self._auth, order_ids=sorted(order_ids))
+                self.logger.info("批量撤单已提交: %s", sorted(order_ids))
+                return
+            except Exception as e:
+                self.logger.warning("批量撤单失败，改为逐单撤单: %s", e)
+        await self.cancel_all_orders(symbol=symbol)
+
+    async def _cancel_order_with_retry(self, order: dict):
+        """
+        通过订单流取消单个订单（连接断开时重试，最终失败只记录日志）
+        Args:
+            order (dict): 缓存中的订单数据
+        """
+        max_retries = 3
+        retry_delay = self.ORDER_RETRY_DELAY_INITIAL
+
+        for attempt in range(max_retries):
+            try:
+                await self._ensure_order_stream_connected()
+                
+                await self._order_stream.cancel_order(
+                    order_id=order["id"],
+                    cl_ord_id=order["cl_ord_id"],
+                    callback=self.on_cancel_order,
+                )
+                # 取消成功，跳出重试循环
+                break
+                
+            except Exception as e:
+                error_msg = str(e)
+                is_connection_error = (
+                    "WebSocket发送失败" in error_msg
+                    or "WebSocket 未连接" in error_msg
+                    or "ConnectionClosed" in error_msg
+                    or "going away" in error_msg
+                )
+                
+                if is_connection_error and attempt < max_retries - 1:
+                    self.logger.warning(
+                        "取消订单失败(连接断开)，%.1f秒后重连重试 (%d/%d): %s",
+                        retry_delay,
+                        attempt + 1,
+                        max_retries,
+                        error_msg,
                     )
-                    # 取消成功，跳出重试循环
+                    # 标记连接断开，下次循环会触发重连
+                    if self._order_stream:
+                        self._order_stream.connected = False
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    # 记录异常但继续取消其他订单
+                    self.logger.exception("取消订单失败(最终): %s", e)
                     break
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    is_connection_error = (
-                        "WebSocket发送失败" in error_msg
-                        or "WebSocket 未连接" in error_msg
-                        or "ConnectionClosed" in error_msg
-                        or "going away" in error_msg
-                    )
-                    
-                    if is_connection_error and attempt < max_retries - 1:
-                        self.logger.warning(
-                            "取消订单失败(连接断开)，%d秒后重试 (%d/%d): %s",
-                            retry_delay,
-                            attempt + 1,
-                            max_retries,
-                            error_msg,
-                        )
-                        # 标记连接断开，下次循环会触发重连
-                        if self._order_stream:
-                            self._order_stream.connected = False
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        # 记录异常但继续取消其他订单
-                        self.logger.exception("取消订单失败(最终): %s", e)
-                        break
 
     async def cleanup(self):
         """清理资源，关闭 WebSocket 连接"""
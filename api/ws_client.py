@@ -1,6 +1,9 @@
 # 标准库导入
 import asyncio
 import json
+import os
+import socket
+import sys
 import uuid
 import time
 from typing import Dict, Any, Optional, Callable, List
@@ -9,11 +12,31 @@ from typing import Dict, Any, Optional, Callable, List
 import websockets
 from websockets.exceptions import ConnectionClosed
 
+# 可选依赖：安装了 orjson 时用于解析推送消息（depth_book 每次推送都要解析）和序列化发送的消息，否则回退到标准库
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        # orjson 输出 bytes，解码为 str 以文本帧发送（bytes 会被 websockets 作为二进制帧发送）
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
 # 本地模块导入
 from logger import get_logger
 from standx_auth import StandXAuth
 
 
+# Linux SO_BUSY_POLL 选项号（部分 Python 版本的 socket 模块未导出该常量；46 仅在 Linux 上有意义）
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46)
+IS_LINUX = sys.platform.startswith("linux")
+
+
 class StandXMarketStream:
     """Market Stream - 市场数据流"""
 
@@ -24,7 +47,9 @@ class StandXMarketStream:
         self.connected = False
         self.authenticated = False
         self._connect_time: Optional[float] = None  # 记录连接时间，用于 24 小时重连
+        self.on_disconnect: Optional[Callable[[], None]] = None  # 接收循环退出（连接断开）时调用
         self.logger = get_logger(__name__)
+        self._busy_poll_us = self._parse_busy_poll_us()  # 创建时解析一次，配置错误不影响连接
 
     async def connect(self):
         """建立 WebSocket 连接"""
@@ -41,44 +66,78 @@ class StandXMarketStream:
                 ping_timeout=300.0,  # 5 分钟超时（服务器要求）
             )
             self.connected = True
-            self._connect_time = time.time()  # 记录连接时间
+            self._connect_time = time.monotonic()  # 记录连接时间
+            self._enable_busy_poll()
             # 启动消息接收任务
             asyncio.create_task(self._receive_messages())
         except Exception as e:
             self.connected = False
             raise Exception(f"WebSocket 连接失败: {e}")
 
+    def _parse_busy_poll_us(self) -> int:
+        """
+        解析 MARKET_MAKER_WS_BUSY_POLL_US（微秒）；非 Linux、未设置或格式错误时返回 0（关闭）
+        """
+        value = os.getenv("MARKET_MAKER_WS_BUSY_POLL_US")
+        if not value or not IS_LINUX:
+            return 0
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            self.logger.warning("MARKET_MAKER_WS_BUSY_POLL_US 格式错误，不开启 SO_BUSY_POLL: %s", value)
+            return 0
+
+    def _enable_busy_poll(self):
+        """
+        按 MARKET_MAKER_WS_BUSY_POLL_US 为行情 socket 开启 SO_BUSY_POLL（仅 Linux，默认关闭）
+        内核在读取时忙轮询网卡队列，减少中断唤醒带来的推送延迟
+        """
+        busy_poll_us = self._busy_poll_us
+        if busy_poll_us <= 0:
+            return
+        sock = self.ws.transport.get_extra_info("socket") if self.ws else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll_us)
+            self.logger.info("行情 socket 已开启 SO_BUSY_POLL: %d us", busy_poll_us)
+        except OSError as e:
+            # 缺少 CAP_NET_ADMIN 等原因设置失败，不影响正常运行
+            self.logger.warning("开启 SO_BUSY_POLL 失败: %s", e)
+
     async def _receive_messages(self):
         """接收消息"""
         try:
             self.logger.info("WebSocket消息接收循环已启动")
-            async for message in self.ws:
+            while True:
+                # decode=False：文本帧直接以 bytes 交给 JSON 解析，省去一次 UTF-8 解码成 str
+                message = await self.ws.recv(decode=False)
                 try:
-                    data = json.loads(message)
-                    # 异步处理消息，避免阻塞接收循环
-                    asyncio.create_task(self._handle_message(data))
+                    self._dispatch(_json_loads(message))
                 except Exception as e:
-                    self.logger.exception(f"处理消息错误: {e}")
+                    self.logger.exception("处理消息错误: %s", e)
         except ConnectionClosed as e:
-            self.logger.error(f"WebSocket连接已关闭: {e}, 运行时长: {time.time() - self._connect_time:.1f}秒")
+            # 主动 disconnect() 后连接时间已清空（recv 在正常关闭时同样抛出 ConnectionClosed）
+            uptime = time.monotonic() - self._connect_time if self._connect_time else 0.0
+            self.logger.error("WebSocket连接已关闭: %s, 运行时长: %.1f秒", e, uptime)
             self.connected = False
         except Exception as e:
-            self.logger.exception(f"接收消息严重错误: {e}")
+            self.logger.exception("接收消息严重错误: %s", e)
             self.connected = False
         finally:
             self.logger.warning("WebSocket消息接收循环已退出")
-
-    async def _handle_message(self, data: Dict[str, Any]):
-        """处理接收到的消息"""
-        channel = data.get("channel")
-        if channel and channel in self.callbacks:
-            callback = self.callbacks[channel]
-            # 如果回调是协程函数，使用 await；否则直接调用
-            if asyncio.iscoroutinefunction(callback):
-                await callback(data)
-            else:
-                # 在事件循环中执行同步回调，避免阻塞
-                callback(data)
+            if self.on_disconnect:
+                self.on_disconnect()
+
+    def _dispatch(self, data: Dict[str, Any]):
+        """按频道分发消息：同步回调（如 depth_book）直接在接收任务中执行，不为每条推送创建任务；协程回调仍放到独立任务，避免阻塞接收循环"""
+        callback = self.callbacks.get(data.get("channel"))
+        if callback is None:
+            return
+        if asyncio.iscoroutinefunction(callback):
+            asyncio.create_task(callback(data))
+        else:
+            callback(data)
 
     async def authenticate(
         self, token: str, streams: Optional[List[Dict[str, str]]] = None
@@ -92,7 +151,7 @@ class StandXMarketStream:
         if streams:
             auth_msg["auth"]["streams"] = streams
 
-        await self.ws.send(json.dumps(auth_msg))
+        await self.ws.send(_json_dumps(auth_msg))
 
     async def subscribe(
         self,
@@ -116,7 +175,7 @@ class StandXMarketStream:
     async def _send_message(self, message: Dict[str, Any]):
         """发送消息"""
         if self.ws:
-            await self.ws.send(json.dumps(message))
+            await self.ws.send(_json_dumps(message))
 
     async def disconnect(self):
         """关闭连接"""
@@ -147,14 +206,16 @@ class StandXOrderStream:
             # 服务器每 10 秒发送 ping，客户端自动响应 pong
             # ping_interval=None 表示不主动发送 ping，只响应服务器的 ping
             # ping_timeout 设置为 5 分钟（服务器要求 5 分钟内响应）
+            # 订单请求/回报都是几百字节的小帧，关闭 permessage-deflate，省去每帧压缩/解压的 CPU 和延迟
             self.ws = await websockets.connect(
                 self.base_url,
                 proxy=None,
                 ping_interval=None,  # 不主动发送 ping（服务器会发送）
                 ping_timeout=300.0,  # 5 分钟超时（服务器要求）
+                compression=None,
             )
             self.connected = True
-            self._connect_time = time.time()  # 记录连接时间
+            self._connect_time = time.monotonic()  # 记录连接时间
             # 启动消息接收任务
             asyncio.create_task(self._receive_messages())
         except Exception as e:
@@ -165,18 +226,21 @@ class StandXOrderStream:
         """接收消息"""
         try:
             self.logger.info("WebSocket订单流接收循环已启动")
-            async for message in self.ws:
+            while True:
+                message = await self.ws.recv(decode=False)
                 try:
-                    data = json.loads(message)
+                    data = _json_loads(message)
                     # 异步处理消息，避免阻塞接收循环
                     asyncio.create_task(self._handle_message(data))
                 except Exception as e:
-                    self.logger.exception(f"处理消息错误: {e}")
+                    self.logger.exception("处理消息错误: %s", e)
         except ConnectionClosed as e:
-            self.logger.error(f"WebSocket订单流已关闭: {e}, 运行时长: {time.time() - self._connect_time:.1f}秒")
+            # 主动 disconnect() 后连接时间已清空（recv 在正常关闭时同样抛出 ConnectionClosed）
+            uptime = time.monotonic() - self._connect_time if self._connect_time else 0.0
+            self.logger.error("WebSocket订单流已关闭: %s, 运行时长: %.1f秒", e, uptime)
             self.connected = False
         except Exception as e:
-            self.logger.exception(f"接收消息严重错误: {e}")
+            self.logger.exception("接收消息严重错误: %s", e)
             self.connected = False
         finally:
             self.logger.warning("WebSocket订单流接收循环已退出")
@@ -210,7 +274,7 @@ class StandXOrderStream:
         if callback:
             self.callbacks[request_id] = callback
 
-        await self.ws.send(json.dumps(message))
+        await self.ws.send(_json_dumps(message))
 
     async def new_order(
         self,
@@ -246,20 +310,19 @@ class StandXOrderStream:
         if cl_ord_id:
             params["cl_ord_id"] = cl_ord_id
 
-        params_str = json.dumps(params)
-        request_id = str(uuid.uuid4())
-        timestamp = int(time.time())
+        # 紧凑序列化：签名与发送的都是这一份字符串，与 HTTP 下单一致
+        params_str = json.dumps(params, separators=(",", ":"))
 
-        # 生成签名头
-        # sign_headers = self.auth.sign_request(params_str, request_id, timestamp)
+        # 生成签名头；签名里的 x-request-id 本身就是新生成的 UUID，直接复用为请求 ID，不再另生成一个
         sign_headers = self.auth._body_signature_headers(params_str)
+        request_id = sign_headers["x-request-id"]
 
         message = {
             "session_id": self.session_id,
             "request_id": request_id,
             "method": "order:new",
             "header": {
-                "x-request-id": sign_headers["x-request-id"],
+                "x-request-id": request_id,
                 "x-request-timestamp": sign_headers["x-request-timestamp"],
                 "x-request-signature": sign_headers["x-request-signature"],
             },
@@ -270,7 +333,7 @@ class StandXOrderStream:
             self.callbacks[request_id] = callback
 
         try:
-            await self.ws.send(json.dumps(message))
+            await self.ws.send(_json_dumps(message))
         except Exception as e:
             # WebSocket连接断开时标记状态并抛出异常
             self.connected = False
@@ -298,19 +361,18 @@ class StandXOrderStream:
         if cl_ord_id:
             params["cl_ord_id"] = cl_ord_id
 
-        params_str = json.dumps(params)
-        request_id = str(uuid.uuid4())
-        timestamp = int(time.time())
+        params_str = json.dumps(params, separators=(",", ":"))
 
-        # 生成签名头
+        # 生成签名头，复用其中的 x-request-id 作为请求 ID
         sign_headers = self.auth._body_signature_headers(params_str)
+        request_id = sign_headers["x-request-id"]
 
         message = {
             "session_id": self.session_id,
             "request_id": request_id,
             "method": "order:cancel",
             "header": {
-                "x-request-id": sign_headers["x-request-id"],
+                "x-request-id": request_id,
                 "x-request-timestamp": sign_headers["x-request-timestamp"],
                 "x-request-signature": sign_headers["x-request-signature"],
             },
@@ -321,7 +383,7 @@ class StandXOrderStream:
             self.callbacks[request_id] = callback
 
         try:
-            await self.ws.send(json.dumps(message))
+            await self.ws.send(_json_dumps(message))
         except Exception as e:
             # WebSocket连接断开时标记状态并抛出异常
             self.connected = False
@@ -3,16 +3,127 @@ Lightweight logging helper for the project.
 
 Provides configure_logging() and get_logger(name).
 Defaults to INFO level and RotatingFileHandler writing to logs/market_maker.log.
+Records are handed to a QueueHandler; a background QueueListener thread does
+the console/file I/O so the event loop never blocks on a write. The queue is
+bounded (LOG_QUEUE_MAXSIZE): when output falls behind, new records are dropped
+and the drop count is logged once the queue has room again.
 """
 
 # 标准库导入
 from __future__ import annotations
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from typing import Optional
 
 
+DEFAULT_LOG_QUEUE_MAXSIZE = 10000
+
+# 导入时日志尚未配置：配置错误先记下，configure_logging() 中再输出警告
+_queue_maxsize_error: Optional[str] = None
+try:
+    _queue_maxsize = int(os.getenv("LOG_QUEUE_MAXSIZE", str(DEFAULT_LOG_QUEUE_MAXSIZE)))
+except ValueError:
+    _queue_maxsize = DEFAULT_LOG_QUEUE_MAXSIZE
+    _queue_maxsize_error = os.getenv("LOG_QUEUE_MAXSIZE")
+
+# 后台日志线程：调用方只把 LogRecord 放入队列，写终端/写文件由监听线程完成
+# 队列有上限：输出跟不上（磁盘/终端阻塞）时丢弃新日志，而不是让内存无限增长
+_log_queue: queue.Queue = queue.Queue(maxsize=_queue_maxsize)
+_listener: Optional[logging.handlers.QueueListener] = None
+_output_handlers: list = []  # 实际输出处理器（控制台/文件），由监听线程调用
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """队列满时丢弃日志（不阻塞调用方），队列恢复后补记一条丢弃数量"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        在调用方线程格式化消息后原地放入队列
+        与标准实现相同，但不复制 LogRecord：本处理器是 root 上唯一的处理器，没有其他处理器需要原始记录
+        （格式化和 UTF-8 编码输出都在监听线程中完成）
+        """
+        msg = self.format(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "日志队列已满，丢弃了 %d 条日志",
+                    "args": (self.dropped,),
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """
+    停止时有界等待（输出阻塞时不让进程退出或重新配置无限挂起）：
+    队列已满时放入结束标记最多等待 STOP_TIMEOUT 秒，仍满则丢弃最旧的一条日志腾出位置；
+    等待监听线程退出同样最多 STOP_TIMEOUT 秒
+    """
+
+    STOP_TIMEOUT = 5.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 每个监听器使用自己的结束标记：超时未退出的旧线程留在队列里的标记不会让新监听器停止
+        self._sentinel = object()
+
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=self.STOP_TIMEOUT)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(self._sentinel)
+            except queue.Full:
+                pass
+
+    def handle(self, record):
+        # 忽略其他监听器留下的结束标记
+        if isinstance(record, logging.LogRecord):
+            super().handle(record)
+
+    def stop(self):
+        if self._thread:
+            self.enqueue_sentinel()
+            self._thread.join(timeout=self.STOP_TIMEOUT)
+            self._thread = None
+
+
+def _stop_listener():
+    """停止监听线程并输出队列中剩余的日志（进程退出或重新配置时调用）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def configure_logging(
     level: Optional[str] = None,
     log_file: Optional[str] = None,
@@ -54,40 +165,54 @@ def configure_logging(
     logger = logging.getLogger()
     logger.setLevel(numeric_level)
 
-    # 如果已有handlers，检查是否需要更新文件处理器
-    if logging.root.handlers:
-        # 移除旧的文件处理器，保留控制台处理器
-        handlers_to_remove = []
-        for handler in logger.handlers:
-            if isinstance(handler, logging.handlers.RotatingFileHandler):
-                handlers_to_remove.append(handler)
-        
-        for handler in handlers_to_remove:
-            logger.removeHandler(handler)
-            handler.close()
+    # 重新配置前先停止监听线程（会输出完队列中已有的日志），再调整输出处理器
+    _stop_listener()
+
+    # 移除旧的文件处理器，保留控制台处理器
+    for handler in [h for h in _output_handlers if isinstance(h, logging.handlers.RotatingFileHandler)]:
+        _output_handlers.remove(handler)
+        handler.close()
     
     fmt = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
     formatter = logging.Formatter(fmt)
 
     # 如果没有控制台处理器，添加一个
     if not any(isinstance(h, logging.StreamHandler) and not isinstance(h, logging.handlers.RotatingFileHandler) 
-               for h in logger.handlers):
+               for h in _output_handlers):
         ch = logging.StreamHandler()
         ch.setLevel(numeric_level)
         ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        _output_handlers.append(ch)
 
     # File handler (rotating) - only add if env_file is specified
+    file_error = None
     if env_file:
         try:
             os.makedirs(os.path.dirname(env_file), exist_ok=True)
             fh = logging.handlers.RotatingFileHandler(env_file, maxBytes=max_bytes, backupCount=backup_count)
             fh.setLevel(numeric_level)
             fh.setFormatter(formatter)
-            logger.addHandler(fh)
+            _output_handlers.append(fh)
         except Exception:
             # If file handler cannot be created, continue with console only
-            logger.warning("Could not create log file '%s', continuing with console logging", env_file)
+            file_error = env_file
+
+    # root 只挂一个 QueueHandler，输出处理器由后台监听线程驱动
+    if not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        logger.addHandler(_DroppingQueueHandler(_log_queue))
+
+    global _listener
+    _listener = _QueueListener(
+        _log_queue, *_output_handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    if file_error:
+        logger.warning("Could not create log file '%s', continuing with console logging", file_error)
+    if _queue_maxsize_error is not None:
+        logger.warning(
+            "Invalid LOG_QUEUE_MAXSIZE '%s', using default %d", _queue_maxsize_error, DEFAULT_LOG_QUEUE_MAXSIZE
+        )
 
 
 def get_logger(name: str):
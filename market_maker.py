@@ -8,9 +8,12 @@
 # 标准库导入
 import argparse
 import asyncio
+import logging
 import os
 import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -34,9 +37,100 @@ from notifier import Notifier
 from logger import get_logger, configure_logging
 
 
+def evaluate_deviation(
+    mid_price: float,
+    buy_price: float,
+    sell_price: float,
+    min_bps: float,
+    max_bps: float,
+) -> tuple[bool, float, float]:
+    """
+    计算买卖单相对中间价的偏离，并判断是否超出允许范围
+    
+    纯数值函数（不访问实例状态），可单独用 mypyc/Cython 编译
+    
+    Args:
+        mid_price: 中间价
+        buy_price: 买单价格
+        sell_price: 卖单价格
+        min_bps: 最小允许偏离
+        max_bps: 最大允许偏离
+    
+    Returns:
+        (out_of_range, buy_bps, sell_bps) 是否超出范围、买单偏离、卖单偏离
+    """
+    bps_scale = 10000 / mid_price  # 买卖两侧共用一次除法
+    buy_bps = abs(mid_price - buy_price) * bps_scale
+    sell_bps = abs(sell_price - mid_price) * bps_scale
+    # 链式比较：每侧一次区间判断
+    out_of_range = not (
+        min_bps <= buy_bps <= max_bps and min_bps <= sell_bps <= max_bps
+    )
+    return out_of_range, buy_bps, sell_bps
+
+
+class TokenBucket:
+    """令牌桶限速器（单事件循环内使用，无需加锁）"""
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Args:
+            rate: 每秒补充的令牌数，<=0 表示不限速
+            burst: 桶容量（允许的突发次数）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+
+    def acquire(self, n: float = 1) -> bool:
+        """
+        尝试取出 n 个令牌
+        
+        Args:
+            n: 需要的令牌数
+        
+        Returns:
+            是否取到（取不到时不等待，由调用方决定跳过）
+        """
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+
 class MarketMaker:
     """双向限价单做市器"""
 
+    # 资产类别风险系数配置（考虑不同市场的波动特性）
+    ASSET_RISK_MULTIPLIERS = {
+        "XAU": 0.5,  # 黄金：低波动贵金属
+        "XAG": 0.5,  # 白银：低波动贵金属
+        "BTC": 1.0,  # 比特币：高波动加密货币
+        "ETH": 1.0,  # 以太坊：高波动加密货币
+    }
+
+    # 持仓监控节拍（秒）
+    POSITION_CHECK_INTERVAL = 0.5
+
+    # 重挂时等待新价格的超时（秒），与撤单确认并行计时
+    REPLACE_PRICE_TIMEOUT = 5.0
+
+    # 价格监控等待推送的时长（秒），超时后检查行情是否中断、是否需要 HTTP 兜底
+    PRICE_FALLBACK_TIMEOUT = 5.0
+
+    # 各风险等级的挂单参数：(target_bps, min_bps, max_bps, 描述)
+    RISK_LEVEL_BPS = {
+        "low": (9.0, 8.0, 10.0, "低风险"),
+        "medium": (25.0, 20.0, 30.0, "中风险"),
+        "high": (80.0, 60.0, 100.0, "高风险"),
+    }
+
     def __init__(
         self,
         auth: StandXAuth,
@@ -73,14 +167,39 @@ class MarketMaker:
         # 通知器
         self.notifier = notifier or Notifier.from_env()
 
-        # 挂单参数（静态）
-        self.target_bps = target_bps
-        self.min_bps = min_bps
-        self.max_bps = max_bps
+        # 挂单参数（同时预计算价格乘数）
+        self._set_bps(target_bps, min_bps, max_bps)
 
         self.leverage = 40  # 杠杆倍数
         self.margin_mode = "isolated"  # 单仓模式
 
+        # 做市挂单除价格外的参数均固定，按方向预先构建，下单时只补价格
+        self._limit_order_kwargs = {
+            side: {
+                "symbol": self.symbol,
+                "side": side,
+                "order_type": "limit",
+                "qty": self.qty,
+                "time_in_force": "alo",
+                "reduce_only": False,
+                "margin_mode": self.margin_mode,
+                "leverage": self.leverage,
+            }
+            for side in ("buy", "sell")
+        }
+
+        # 价格精度与格式模板（由交易对决定，初始化时生成一次）
+        self._price_precision = self._get_price_precision()
+        self._format_price = f"{{:.{self._price_precision}f}}".format
+
+        # 资产风险系数只取决于交易对，初始化时确定
+        self._asset_risk_multiplier = self._get_asset_risk_multiplier()
+
+        # 北京时区（缓存实例，避免每次重新构造）
+        self._beijing_tz = ZoneInfo("Asia/Shanghai")
+        self._beijing_str_sec = -1  # 上次格式化对应的秒级时间戳
+        self._beijing_str = ""  # 上次格式化的时间字符串
+
         # 优雅关闭相关
         self._shutdown_requested = False
         self._shutdown_event = asyncio.Event()
@@ -88,6 +207,7 @@ class MarketMaker:
         # 风险评估平滑与迟滞
         self._risk_ema = None  # 风险分数EMA（指数移动平均）
         self._risk_ema_alpha = float(os.getenv("RISK_EMA_ALPHA", "0.3"))  # EMA平滑系数
+        self._risk_check_interval = float(os.getenv("RISK_CHECK_INTERVAL", "0"))  # 风险评估最小间隔（秒），0表示每次检查都评估
         self._current_risk_level = "medium"  # 当前风险等级（low/medium/high）
         
         # 持仓管理参数（分层止盈止损）
@@ -96,6 +216,41 @@ class MarketMaker:
         self._position_force_exit_bps = float(os.getenv("POSITION_FORCE_EXIT_BPS", "5"))  # 二级强制止盈点数
         self._position_stop_loss_bps = float(os.getenv("POSITION_STOP_LOSS_BPS", "4"))  # 止损点数
         self._max_position_hold_time = float(os.getenv("MAX_POSITION_HOLD_TIME", "15"))  # 最大持仓时间（秒）
+        # 按持仓方向预计算止盈/止损价格乘数（参数启动后不变）
+        self._tp_price_mult = {
+            "buy": 1 + self._position_quick_tp_bps / 10000,
+            "sell": 1 - self._position_quick_tp_bps / 10000,
+        }
+        self._sl_price_mult = {
+            "buy": 1 - self._position_stop_loss_bps / 10000,
+            "sell": 1 + self._position_stop_loss_bps / 10000,
+        }
+        # 止盈/止损单流程相同，只有状态键、价格乘数与日志不同，按类型查表
+        self._exit_order_table = {
+            "tp": (
+                "tp_placed",
+                self._tp_price_mult,
+                self._position_quick_tp_bps,
+                "✅ 一级止盈单已挂: 数量=%s, 价格=%s (利润: %.1f bps)",
+                "止盈单挂单失败: %s",
+            ),
+            "sl": (
+                "sl_placed",
+                self._sl_price_mult,
+                self._position_stop_loss_bps,
+                "🛡️ 止损单已挂: 数量=%s, 价格=%s (止损: %.1f bps)",
+                "止损单挂单失败: %s",
+            ),
+        }
+        # 止盈/止损单除方向、数量、价格外的参数固定
+        self._exit_order_kwargs = {
+            "symbol": self.symbol,
+            "order_type": "limit",
+            "time_in_force": "gtc",
+            "reduce_only": True,
+            "margin_mode": self.margin_mode,
+            "leverage": self.leverage,
+        }
         
         # 持仓跟踪状态
         self._tracked_position = None  # 当前跟踪的持仓对象
@@ -109,19 +264,55 @@ class MarketMaker:
         # 余额退出阈值（平仓后如果余额低于此值则优雅退出）
         self._balance_exit_threshold = float(os.getenv("BALANCE_EXIT_THRESHOLD", "10"))  # 默认10 USDT
         
+        # 余额查询节流（定期余额汇报在间隔内复用上次查询结果）
+        self._balance_check_interval = float(os.getenv("MARKET_MAKER_BALANCE_CHECK_SEC", "30"))
+        self._last_balance_check_ts = 0.0
+        self._cached_balance = None
+        self._balance_fill_count = 0  # 上次查询余额时的成交计数，计数变化说明余额可能已变
+        self._balance_max_age = 300.0  # 无成交时余额缓存的最长有效期（秒）
+        self._balance_settle_delay = 5.0  # 平仓确认后等待已实现盈亏结算入账的时间（秒）
+        
+        # 重挂限速（价格在区间边缘来回震荡时，避免撤单/下单请求打满交易所频率限制）
+        self._replace_limiter = TokenBucket(
+            rate=float(os.getenv("MARKET_MAKER_REPLACE_RATE", "5")),
+            burst=float(os.getenv("MARKET_MAKER_REPLACE_BURST", "10")),
+        )
+        # 重挂防抖窗口（秒）：一次撤单/下单周期结束后，窗口内的推送合并到窗口结束时再检查
+        self._replace_debounce = float(os.getenv("MARKET_MAKER_REPLACE_DEBOUNCE_SEC", "0.2"))
+        
         # 获取 logger 实例
         self.logger = get_logger(__name__)
 
     def _setup_signal_handlers(self):
         """设置信号处理器以支持优雅关闭"""
 
-        def handle_signal(signum, frame):
+        def handle_signal(signum, frame=None):
             self.logger.info("收到信号 %s，准备优雅关闭...", signum)
             self._shutdown_requested = True
             self._shutdown_event.set()
 
-        signal.signal(signal.SIGTERM, handle_signal)
-        signal.signal(signal.SIGINT, handle_signal)
+        # 优先注册到事件循环：信号会立即唤醒阻塞在 select 上的循环，
+        # 关闭事件无需等到下一次网络推送才被处理
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, handle_signal, signum)
+            except (NotImplementedError, RuntimeError):
+                # Windows 等平台不支持，退回到 signal.signal
+                signal.signal(signum, handle_signal)
+
+    def _beijing_now_str(self) -> str:
+        """
+        获取当前北京时间字符串（复用缓存的时区实例，同一秒内复用格式化结果）
+        
+        Returns:
+            str: 格式为 %Y-%m-%d %H:%M:%S 的时间字符串
+        """
+        epoch_sec = int(time.time())
+        if epoch_sec != self._beijing_str_sec:
+            self._beijing_str = datetime.fromtimestamp(epoch_sec, self._beijing_tz).strftime("%Y-%m-%d %H:%M:%S")
+            self._beijing_str_sec = epoch_sec
+        return self._beijing_str
 
     def _get_price_precision(self) -> int:
         """
@@ -135,6 +326,34 @@ class MarketMaker:
         else:
             return 2  # 其他（如 BTC-USD）精度 0.01
 
+    def _get_asset_risk_multiplier(self) -> float:
+        """
+        根据交易对获取资产类别风险系数（考虑不同市场的波动特性）
+        
+        Returns:
+            float: 风险系数（未匹配的资产默认 1.0）
+        """
+        for asset_code, multiplier in self.ASSET_RISK_MULTIPLIERS.items():
+            if asset_code in self.symbol:
+                return multiplier
+        return 1.0
+
+    def _set_bps(self, target_bps: float, min_bps: float, max_bps: float):
+        """
+        更新挂单参数，并预计算下单价格乘数（参数不变时下单路径只需乘法）
+        
+        Args:
+            target_bps: 目标挂单偏离
+            min_bps: 最小允许偏离
+            max_bps: 最大允许偏离
+        """
+        if target_bps != getattr(self, "target_bps", None):
+            self._buy_price_mult = 1 - target_bps / 10000
+            self._sell_price_mult = 1 + target_bps / 10000
+        self.target_bps = target_bps
+        self.min_bps = min_bps
+        self.max_bps = max_bps
+
     def calculate_order_prices(self, market_price: float) -> tuple:
         """
         计算双向订单价格
@@ -145,13 +364,12 @@ class MarketMaker:
         Returns:
             (buy_price, sell_price) 买单价格和卖单价格
         """
-        buy_price = market_price * (1 - self.target_bps / 10000)
-        sell_price = market_price * (1 + self.target_bps / 10000)
+        buy_price = market_price * self._buy_price_mult
+        sell_price = market_price * self._sell_price_mult
         
         # 根据交易对精度进行四舍五入
-        precision = self._get_price_precision()
-        buy_price = round(buy_price, precision)
-        sell_price = round(sell_price, precision)
+        buy_price = round(buy_price, self._price_precision)
+        sell_price = round(sell_price, self._price_precision)
         
         return (buy_price, sell_price)
     
@@ -163,20 +381,7 @@ class MarketMaker:
         Returns:
             (risk_score, description) 风险分数 0-100 和描述
         """
-        # 资产类别风险系数配置（考虑不同市场的波动特性）
-        asset_risk_multipliers = {
-            "XAU": 0.5,  # 黄金：低波动贵金属
-            "XAG": 0.5,  # 白银：低波动贵金属
-            "BTC": 1.0,  # 比特币：高波动加密货币
-            "ETH": 1.0,  # 以太坊：高波动加密货币
-        }
-        
-        # 根据交易对识别资产类别
-        asset_multiplier = 1.0  # 默认系数
-        for asset_code, multiplier in asset_risk_multipliers.items():
-            if asset_code in self.symbol:
-                asset_multiplier = multiplier
-                break
+        asset_multiplier = self._asset_risk_multiplier
         
         depth_data = self.exchange_adapter.get_depth_book_data()
         if not depth_data:
@@ -192,25 +397,28 @@ class MarketMaker:
         if not mid_price:
             return 50.0, "价格缺失"
         
+        bps_scale = 10000 / mid_price  # 价差与档位跨度共用一次除法
+        
         # 1. 计算买卖盘口价差（相对值）
-        best_bid = float(bids[0][0])
-        best_ask = float(asks[0][0])
-        spread_bps = (best_ask - best_bid) / mid_price * 10000
+        best_bid = bids[0][0]
+        best_ask = asks[0][0]
+        spread_bps = (best_ask - best_bid) * bps_scale
         
         # 2. 计算前5档买卖量比
-        bid_volume = sum(float(b[1]) for b in bids[:5])
-        ask_volume = sum(float(a[1]) for a in asks[:5])
-        volume_ratio = min(bid_volume, ask_volume) / max(bid_volume, ask_volume) if max(bid_volume, ask_volume) > 0 else 0.5
+        bid_volume = sum(b[1] for b in bids[:5])
+        ask_volume = sum(a[1] for a in asks[:5])
+        max_volume = max(bid_volume, ask_volume)
+        volume_ratio = min(bid_volume, ask_volume) / max_volume if max_volume > 0 else 0.5
         
         # 3. 改进：计算盘口深度作为"稀疏度"指标（归一化为bps相对指标）
         # 将价格跨度归一化为bps，避免不同价格区间资产（XAU $2800 vs BTC $50000）评估不公平
         if len(bids) >= 10 and len(asks) >= 10:
-            bid_price_range = float(bids[0][0]) - float(bids[9][0])
-            ask_price_range = float(asks[9][0]) - float(asks[0][0])
+            bid_price_range = bids[0][0] - bids[9][0]
+            ask_price_range = asks[9][0] - asks[0][0]
             
             # 将10档跨度归一化为相对于中间价的bps
-            bid_range_bps = (bid_price_range / mid_price) * 10000 if mid_price > 0 else 0
-            ask_range_bps = (ask_price_range / mid_price) * 10000 if mid_price > 0 else 0
+            bid_range_bps = bid_price_range * bps_scale
+            ask_range_bps = ask_price_range * bps_scale
             total_range_bps = (bid_range_bps + ask_range_bps) / 2
             
             # 稀疏度 = 价差bps / 跨度bps 的比例
@@ -261,12 +469,12 @@ class MarketMaker:
         desc = f"价差:{spread_bps:.1f}bps 量比:{volume_ratio:.2f} 稀疏度:{depth_sparsity:.1f} 系数:{asset_multiplier:.1f}"
         return smoothed_score, desc
     
-    def get_adaptive_bps(self) -> tuple[float, float, str]:
+    def get_adaptive_bps(self) -> tuple[float, float, float, str]:
         """
         根据市场风险动态调整挂单偏离（带迟滞阈值）
         
         Returns:
-            (target_bps, min_bps, reason) 目标偏离、最小偏离、决策原因
+            (target_bps, min_bps, max_bps, reason) 目标偏离、最小偏离、最大偏离、决策原因
         """
         # 计算市场风险（已EMA平滑）
         risk_score, risk_desc = self.calculate_market_risk()
@@ -293,22 +501,9 @@ class MarketMaker:
         # 更新当前等级
         self._current_risk_level = new_level
         
-        # 根据风险等级决定挂单策略
-        if new_level == "low":
-            target_bps = 9.0
-            min_bps = 8.0
-            max_bps = 10.0
-            reason = f"低风险({risk_score:.0f})"
-        elif new_level == "medium":
-            target_bps = 25.0
-            min_bps = 20.0
-            max_bps = 30.0
-            reason = f"中风险({risk_score:.0f})"
-        else:  # high
-            target_bps = 80.0
-            min_bps = 60.0
-            max_bps = 100.0
-            reason = f"高风险({risk_score:.0f})"
+        # 根据风险等级查表得到挂单参数
+        target_bps, min_bps, max_bps, level_desc = self.RISK_LEVEL_BPS[new_level]
+        reason = f"{level_desc}({risk_score:.0f})"
         
         return target_bps, min_bps, max_bps, f"{reason} - {risk_desc}"
 
@@ -319,15 +514,10 @@ class MarketMaker:
         Returns:
             (need_replace, reason) 是否需要重挂和原因
         """
-        if (
-            self.exchange_adapter.get_buy_order_count() != 1
-            or self.exchange_adapter.get_sell_order_count() != 1
-        ):
-            self.logger.info(
-                "订单数量异常，买单: %d, 卖单: %d",
-                self.exchange_adapter.get_buy_order_count(),
-                self.exchange_adapter.get_sell_order_count(),
-            )
+        buy_count = self.exchange_adapter.get_buy_order_count()
+        sell_count = self.exchange_adapter.get_sell_order_count()
+        if buy_count != 1 or sell_count != 1:
+            self.logger.info("订单数量异常，买单: %d, 卖单: %d", buy_count, sell_count)
             reason = "订单数量异常（非各1单）"
             return True, reason
         return False, ""
@@ -339,41 +529,44 @@ class MarketMaker:
         Returns:
             (need_replace, reason) 是否需要重挂和原因
         """
+        # 每次价格推送都会调用：只取各方向第一笔订单，不复制订单列表
+        buy_order = self.exchange_adapter.get_first_order("buy")
+        sell_order = self.exchange_adapter.get_first_order("sell")
         if not (
-            self.exchange_adapter.get_buy_orders()
-            and self.exchange_adapter.get_sell_orders()
+            buy_order
+            and sell_order
             and not self.exchange_adapter.is_price_updated_and_processed()
         ):
             return False, ""
         
-        buy_price = float(self.exchange_adapter.get_buy_orders()[0]["price"])
-        buy_bps = abs(
-            (self.exchange_adapter.get_depth_mid_price() - buy_price)
-            / self.exchange_adapter.get_depth_mid_price()
-            * 10000
-        )
-        sell_price = float(self.exchange_adapter.get_sell_orders()[0]["price"])
-        sell_bps = abs(
-            (sell_price - self.exchange_adapter.get_depth_mid_price())
-            / self.exchange_adapter.get_depth_mid_price()
-            * 10000
-        )
-        self.logger.info(
-            "买单: %.2f (偏离: %.1f bps), 卖单: %.2f (偏离: %.1f bps)",
+        buy_price = buy_order["price_f"]
+        sell_price = sell_order["price_f"]
+        mid_price = self.exchange_adapter.get_depth_mid_price()
+        out_of_range, buy_bps, sell_bps = evaluate_deviation(
+            mid_price,
             buy_price,
-            buy_bps,
             sell_price,
-            sell_bps,
+            self.min_bps,
+            self.max_bps,
         )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "买单: %.2f (偏离: %.1f bps), 卖单: %.2f (偏离: %.1f bps)",
+                buy_price,
+                buy_bps,
+                sell_price,
+                sell_bps,
+            )
         
-        if (
-            buy_bps < self.min_bps
-            or buy_bps > self.max_bps
-            or sell_bps < self.min_bps
-            or sell_bps > self.max_bps
-        ):
-            reason = f"订单偏离范围异常（买单: {buy_bps:.1f} bps, 卖单: {sell_bps:.1f} bps）"
-            return True, reason
+        if out_of_range:
+            # 按精度取整后新价格与现有挂单完全相同时（价格精度粗于偏离区间），重挂只会挂回原价，跳过
+            new_buy_price, new_sell_price = self.calculate_order_prices(mid_price)
+            precision = self._price_precision
+            if new_buy_price == round(buy_price, precision) and new_sell_price == round(sell_price, precision):
+                self.logger.debug("偏离超出范围但取整后目标价格与现有挂单相同，跳过重挂")
+            else:
+                reason = f"订单偏离范围异常（买单: {buy_bps:.1f} bps, 卖单: {sell_bps:.1f} bps）"
+                return True, reason
         
         self.exchange_adapter.mark_price_processed()
         return False, ""
@@ -395,72 +588,57 @@ class MarketMaker:
                 return
         
         buy_price, sell_price = self.calculate_order_prices(market_price)
-        precision = self._get_price_precision()
-        price_format = f"{{:.{precision}f}}"
+        # 每个价格只格式化一次，下单与日志共用
+        buy_price_str = self._format_price(buy_price)
+        sell_price_str = self._format_price(sell_price)
 
         self.logger.info("下双向限价单 (市价: %.2f)", market_price)
 
-        # 下买单
-        try:
-            await self.exchange_adapter.new_order(
-                symbol=self.symbol,
-                side="buy",
-                order_type="limit",
-                qty=self.qty,
-                price=price_format.format(buy_price),
-                time_in_force="alo",
-                reduce_only=False,
-                margin_mode=self.margin_mode,
-                leverage=self.leverage,
-            )
-            self.logger.info(
-                "买单: %s @ %s",
-                self.qty,
-                price_format.format(buy_price),
-            )
-        except Exception as e:
-            self.logger.exception("买单失败: %s", e)
+        # 交易所无批量下单接口，买卖两腿并发发送，缩短两腿之间的时间差
+        await asyncio.gather(
+            self._place_limit_leg("buy", buy_price_str),
+            self._place_limit_leg("sell", sell_price_str),
+        )
 
-        # 下卖单
+    async def _place_limit_leg(self, side: str, price_str: str):
+        """下单边限价单（失败只记录日志，不影响另一腿）
+        
+        Args:
+            side: 买卖方向 "buy" 或 "sell"
+            price_str: 已格式化的订单价格
+        """
+        label = "买单" if side == "buy" else "卖单"
         try:
             await self.exchange_adapter.new_order(
-                symbol=self.symbol,
-                side="sell",
-                order_type="limit",
-                qty=self.qty,
-                price=price_format.format(sell_price),
-                time_in_force="alo",
-                reduce_only=False,
-                margin_mode=self.margin_mode,
-                leverage=self.leverage,
+                price=price_str, **self._limit_order_kwargs[side]
             )
             self.logger.info(
-                "卖单: %s @ %s",
+                "%s: %s @ %s",
+                label,
                 self.qty,
-                price_format.format(sell_price),
+                price_str,
             )
         except Exception as e:
-            self.logger.exception("卖单失败: %s", e)
+            self.logger.exception("%s失败: %s", label, e)
 
     async def run(self, check_interval: float = 0.025):
         """
         运行做市策略（事件驱动架构）
 
         Args:
-            check_interval: 保留参数以兼容旧配置，实际使用事件驱动机制
+            check_interval: 两次价格检查的最小间隔（秒），间隔内的连续推送合并为一次检查；0 表示每次推送都检查
         """
         
         # 设置信号处理器
         self._setup_signal_handlers()
 
-        beijing_tz = ZoneInfo("Asia/Shanghai")
-        beijing_time = datetime.now(beijing_tz).strftime("%Y-%m-%d %H:%M:%S")
+        beijing_time = self._beijing_now_str()
         self.logger.info("双向限价单做市策略启动（事件驱动模式） - %s", beijing_time)
         self.logger.info("交易对: %s", self.symbol)
         self.logger.info("订单数量: %s", self.qty)
 
         # 启动通知
-        await self.notifier.send(
+        self.notifier.send_nowait(
             f"*做市策略启动*\n"
             f"账户: `{self.account_name}`\n"
             f"时间: {beijing_time}\n"
@@ -469,14 +647,15 @@ class MarketMaker:
             f"模式: 事件驱动\n"
         )
 
-        # 等待 mid_price 数据就绪（只执行一次）
-        while self.exchange_adapter.get_depth_mid_price() is None:
+        # 等待 mid_price 数据就绪（只执行一次），首次推送到达即继续
+        while not await self.exchange_adapter.wait_for_mid_price(timeout=5.0):
             self.logger.info("等待行情数据（mid_price）...")
-            await asyncio.sleep(0.2)
 
         # 创建独立的监控任务
         try:
-            price_check_task = asyncio.create_task(self._price_monitor_loop())
+            price_check_task = asyncio.create_task(
+                self._price_monitor_loop(min_tick_interval=check_interval)
+            )
             position_check_task = asyncio.create_task(self._position_monitor_loop())
             balance_report_task = asyncio.create_task(self._balance_report_loop())
             shutdown_task = asyncio.create_task(self._shutdown_event.wait())
@@ -510,13 +689,13 @@ class MarketMaker:
 
         except KeyboardInterrupt:
             self.logger.info("收到中断信号，停止策略...")
-            await self.notifier.send(
+            self.notifier.send_nowait(
                 f"*策略停止*\n" f"账户: `{self.account_name}`\n" f"交易对: `{self.symbol}`\n" f"原因: 收到中断信号"
             )
         except Exception as e:
             self.logger.exception("策略运行出现严重错误: %s", e)
             self.logger.info("正在清理订单并退出...")
-            await self.notifier.send(
+            self.notifier.send_nowait(
                 f"*致命异常*\n" f"账户: `{self.account_name}`\n" f"交易对: `{self.symbol}`\n" f"错误: {e}"
             )
 
@@ -534,112 +713,49 @@ class MarketMaker:
         """
         return {
             "qty": qty,
+            "qty_str": str(abs(qty)),  # 下单用数量字符串，止盈/止损/市价平仓共用
+            "close_side": "sell" if side == "buy" else "buy",  # 平仓方向（持仓反方向）
             "side": side,
             "entry_price": entry_price,
-            "entry_time": time.time(),
+            "entry_time": time.monotonic(),  # 单调时钟，不受系统校时影响
             "tp_placed": False,  # 止盈单是否已挂
             "sl_placed": False,  # 止损单是否已挂
             "stage": "entry",    # 持仓阶段: entry->hold->tp_timeout->force_exit
         }
 
-    async def _place_tp_order(self, position: dict) -> bool:
-        """
-        挂一级止盈单（小利润快速退出）
-        
-        Args:
-            position: 持仓对象
-            
-        Returns:
-            是否成功
-        """
-        if position["tp_placed"]:
-            return True
-        
-        try:
-            qty = str(abs(position["qty"]))
-            # 根据持仓方向确定止盈方向（对方向）
-            tp_side = "sell" if position["side"] == "buy" else "buy"
-            # 计算止盈价格
-            tp_price = position["entry_price"] * (
-                1 + self._position_quick_tp_bps / 10000
-                if position["side"] == "buy"
-                else 1 - self._position_quick_tp_bps / 10000
-            )
-            
-            precision = self._get_price_precision()
-            tp_price = round(tp_price, precision)
-            price_format = f"{{:.{precision}f}}"
-            
-            await self.exchange_adapter.new_order(
-                symbol=self.symbol,
-                side=tp_side,
-                order_type="limit",
-                qty=qty,
-                price=price_format.format(tp_price),
-                time_in_force="gtc",
-                reduce_only=True,
-                margin_mode=self.margin_mode,
-                leverage=self.leverage,
-            )
-            
-            position["tp_placed"] = True
-            self.logger.info(
-                "✅ 一级止盈单已挂: 数量=%s, 价格=%s (利润: %.1f bps)",
-                qty, price_format.format(tp_price), self._position_quick_tp_bps
-            )
-            return True
-        except Exception as e:
-            self.logger.exception("止盈单挂单失败: %s", e)
-            return False
-
-    async def _place_sl_order(self, position: dict) -> bool:
+    async def _place_exit_order(self, position: dict, kind: str) -> bool:
         """
-        挂止损单（防止亏损扩大）
+        挂止盈单（kind="tp"，小利润快速退出）或止损单（kind="sl"，防止亏损扩大）
         
         Args:
             position: 持仓对象
+            kind: 订单类型，"tp" 或 "sl"
             
         Returns:
             是否成功
         """
-        if position["sl_placed"]:
+        placed_key, price_mult, bps, success_msg, error_msg = self._exit_order_table[kind]
+        if position[placed_key]:
             return True
         
         try:
-            qty = str(abs(position["qty"]))
-            # 根据持仓方向确定止损方向（对方向）
-            sl_side = "sell" if position["side"] == "buy" else "buy"
-            # 计算止损价格
-            sl_price = position["entry_price"] * (
-                1 - self._position_stop_loss_bps / 10000
-                if position["side"] == "buy"
-                else 1 + self._position_stop_loss_bps / 10000
-            )
-            
-            precision = self._get_price_precision()
-            sl_price = round(sl_price, precision)
-            price_format = f"{{:.{precision}f}}"
+            qty = position["qty_str"]
+            # 按持仓方向的价格乘数计算挂单价，挂在持仓反方向
+            price = position["entry_price"] * price_mult[position["side"]]
+            price_str = self._format_price(round(price, self._price_precision))
             
             await self.exchange_adapter.new_order(
-                symbol=self.symbol,
-                side=sl_side,
-                order_type="limit",
+                side=position["close_side"],
                 qty=qty,
-                price=price_format.format(sl_price),
-                time_in_force="gtc",
-                reduce_only=True,
-                margin_mode=self.margin_mode,
-                leverage=self.leverage,
+                price=price_str,
+                **self._exit_order_kwargs,
             )
             
-            position["sl_placed"] = True
-            self.logger.info(
-                "🛡️ 止损单已挂: 数量=%s, 价格=%s (止损: %.1f bps)",
-                qty, price_format.format(sl_price), self._position_stop_loss_bps
-            )
+            position[placed_key] = True
+            self.logger.info(success_msg, qty, price_str, bps)
             return True
         except Exception as e:
-            self.logger.exception("止损单挂单失败: %s", e)
+            self.logger.exception(error_msg, e)
             return False
 
     async def _cancel_tp_sl_orders(self, position: dict):
@@ -657,15 +773,46 @@ class MarketMaker:
         except Exception as e:
             self.logger.exception("取消止盈/止损单失败: %s", e)
 
+    async def _get_balance(self) -> dict:
+        """
+        查询账户余额（带缓存，仅用于定期余额汇报；退出判断直接查询）
+        
+        - 距上次查询不足 _balance_check_interval 秒：直接返回缓存（节流上限）
+        - 之后若没有新的成交推送且缓存未超过 _balance_max_age 秒：余额不会变化，继续返回缓存
+        
+        Returns:
+            余额快照字典
+        """
+        now = time.monotonic()
+        if self._cached_balance is not None:
+            age = now - self._last_balance_check_ts
+            balance_dirty = self.exchange_adapter.get_fill_count() != self._balance_fill_count
+            if age < self._balance_check_interval or (
+                not balance_dirty and age < self._balance_max_age
+            ):
+                return self._cached_balance
+        
+        fill_count = self.exchange_adapter.get_fill_count()
+        balance = await api.query_balance(self.auth)
+        self._cached_balance = balance
+        self._last_balance_check_ts = now
+        self._balance_fill_count = fill_count
+        return balance
+
     async def _check_balance_and_exit(self):
         """
         检查账户余额，如果低于阈值则触发优雅退出
         """
         try:
-            # 等待5秒让平仓订单完全结算
-            await asyncio.sleep(5.0)
+            # 先等待平仓确认（持仓推送归零，最多5秒）：未确认时余额仍含持仓，本次不做退出判断
+            if not await self.exchange_adapter.wait_for_position_closed(timeout=5.0):
+                self.logger.warning("平仓未确认，跳过本次余额退出检查")
+                return
+            
+            # 再留出结算时间：持仓推送到达时交易所可能尚未把已实现盈亏计入余额
+            await asyncio.sleep(self._balance_settle_delay)
             
-            # 查询余额
+            # 直接查询余额，不使用缓存：退出判断需要平仓后的最新余额
             balance = await api.query_balance(self.auth)
             total_balance = float(balance.get("balance", "0"))
             equity = float(balance.get("equity", "0"))
@@ -684,9 +831,8 @@ class MarketMaker:
                 
                 # 发送通知
                 if self.notifier:
-                    beijing_tz = ZoneInfo("Asia/Shanghai")
-                    beijing_time = datetime.now(beijing_tz).strftime("%Y-%m-%d %H:%M:%S")
-                    await self.notifier.send(
+                    beijing_time = self._beijing_now_str()
+                    self.notifier.send_nowait(
                         f"⚠️ *余额不足，程序退出*\n"
                         f"账户: `{self.account_name}`\n"
                         f"时间: {beijing_time}\n"
@@ -718,8 +864,8 @@ class MarketMaker:
             是否成功
         """
         try:
-            qty = str(abs(position["qty"]))
-            close_side = "sell" if position["side"] == "buy" else "buy"
+            qty = position["qty_str"]
+            close_side = position["close_side"]
             
             await self.exchange_adapter.new_order(
                 symbol=self.symbol,
@@ -740,48 +886,72 @@ class MarketMaker:
             self.logger.exception("市价平仓失败: %s", e)
             return False
 
-    async def _price_monitor_loop(self):
+    async def _price_monitor_loop(self, min_tick_interval: float = 0.0):
         """
-        价格监控循环 - 仅在价格变化时触发检查
+        价格监控循环 - 仅在价格变化或订单成交时触发检查
         使用事件驱动机制 + 自适应挂单策略
+        
+        Args:
+            min_tick_interval: 两次检查的最小间隔（秒），0 表示不合并
         """
         self.logger.info("价格监控任务启动（自适应挂单模式）")
         
+        loop = asyncio.get_running_loop()
+        last_check_time = 0.0
+        last_replace_time = float("-inf")
+        last_risk_check_time = float("-inf")
+        last_seen = None  # 上次检查时的 (价格推送序号, 成交计数)，首轮直接用已就绪的价格检查
+        
         while not self._shutdown_requested:
             try:
-                # 等待新价格更新（阻塞直到有新价格或超时）
-                price_updated = await self.exchange_adapter.wait_for_new_price(timeout=30.0)
+                # 上一轮检查/重挂期间已有新价格或成交时直接检查，否则等待价格更新或成交推送
+                if (self.exchange_adapter.get_price_seq(), self.exchange_adapter.get_fill_count()) == last_seen:
+                    updated = await self.exchange_adapter.wait_for_update(
+                        timeout=self.PRICE_FALLBACK_TIMEOUT
+                    )
+                    
+                    # 推送中断（重连期间）时用 HTTP 查询价格兜底，挂单不会长时间按过期价格判断
+                    if not updated and not await self.exchange_adapter.refresh_mid_price_from_rest():
+                        self.logger.debug("%.0f秒内无价格更新，继续等待...", self.PRICE_FALLBACK_TIMEOUT)
+                        continue
                 
-                if not price_updated:
-                    # 30秒无新价格更新，继续等待
-                    self.logger.debug("30秒内无价格更新，继续等待...")
-                    continue
+                # 合并突发推送：距上次检查不足最小间隔、或距上次重挂不足防抖窗口时，
+                # 等到窗口结束再用最新缓存价格检查
+                remaining = max(
+                    last_check_time + min_tick_interval,
+                    last_replace_time + self._replace_debounce,
+                ) - loop.time()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                last_check_time = loop.time()
+                # 本轮检查读取的是最新缓存状态，此前的推送都视为已消费（只处理最新价格）
+                last_seen = (self.exchange_adapter.get_price_seq(), self.exchange_adapter.get_fill_count())
                 
-                # 动态调整挂单参数（基于市场风险）
-                new_target_bps, new_min_bps, new_max_bps, reason = self.get_adaptive_bps()
-                self.logger.info("当前风险等级: %s, 目标偏离: %.1f bps", self._current_risk_level, new_target_bps)
+                # 动态调整挂单参数（基于市场风险），按 _risk_check_interval 节流
+                now = loop.time()
+                if now - last_risk_check_time >= self._risk_check_interval:
+                    last_risk_check_time = now
+                    new_target_bps, new_min_bps, new_max_bps, reason = self.get_adaptive_bps()
+                    self.logger.info("当前风险等级: %s, 目标偏离: %.1f bps", self._current_risk_level, new_target_bps)
 
-                # 检测参数是否发生显著变化（超过20%）
-                params_changed = (
-                    abs(new_target_bps - self.target_bps) / self.target_bps > 0.2 if self.target_bps > 0 else False
-                )
-                
-                if params_changed:
-                    self.logger.info(
-                        "📊 挂单参数调整: %.1f→%.1f bps (范围: %.1f-%.1f), 原因: %s",
-                        self.target_bps, new_target_bps, new_min_bps, new_max_bps, reason
+                    # 检测参数是否发生显著变化（超过20%）
+                    params_changed = (
+                        abs(new_target_bps - self.target_bps) / self.target_bps > 0.2 if self.target_bps > 0 else False
                     )
-                    self.target_bps = new_target_bps
-                    self.min_bps = new_min_bps
-                    self.max_bps = new_max_bps
-                    # 参数变化时强制重挂单
-                    await self._replace_orders(f"策略调整: {reason}")
-                    continue
-                else:
-                    # 参数未变化，更新内部值（用于下次比较）
-                    self.target_bps = new_target_bps
-                    self.min_bps = new_min_bps
-                    self.max_bps = new_max_bps
+                    
+                    if params_changed:
+                        self.logger.info(
+                            "📊 挂单参数调整: %.1f→%.1f bps (范围: %.1f-%.1f), 原因: %s",
+                            self.target_bps, new_target_bps, new_min_bps, new_max_bps, reason
+                        )
+                        self._set_bps(new_target_bps, new_min_bps, new_max_bps)
+                        # 参数变化时强制重挂单
+                        await self._replace_orders(f"策略调整: {reason}")
+                        last_replace_time = loop.time()
+                        continue
+                    else:
+                        # 参数未变化，更新内部值（用于下次比较）
+                        self._set_bps(new_target_bps, new_min_bps, new_max_bps)
                 
                 # 正常偏离检查
                 need_replace, check_reason = self.check_order_count()
@@ -790,6 +960,7 @@ class MarketMaker:
                 
                 if need_replace:
                     await self._replace_orders(check_reason)
+                    last_replace_time = loop.time()
                     
             except asyncio.TimeoutError:
                 # wait_for_new_price 超时，继续循环
@@ -813,11 +984,21 @@ class MarketMaker:
         """
         self.logger.info("持仓监控任务启动（分层止盈止损模式）")
         
+        # 按固定节拍检查：本轮处理耗时计入间隔，而不是在处理后再额外睡满一个间隔
+        # 节拍之间收到持仓推送时立即检查（新持仓尽快挂止盈止损），节拍保持不变
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        
         while not self._shutdown_requested:
+            delay = next_tick - loop.time()
+            if delay <= 0 or not await self.exchange_adapter.wait_for_position_update(timeout=delay):
+                # 处理超时则跳过落后的节拍，不连续补跑
+                next_tick = max(next_tick + self.POSITION_CHECK_INTERVAL, loop.time())
+            
             try:
                 # 1. 检查是否有新持仓（来自 exchange_adapter）
                 current_position = await self.exchange_adapter.get_position(symbol=self.symbol)
-                current_qty = float(current_position.get("qty", 0)) if current_position else 0
+                current_qty = current_position.get("qty_f", 0) if current_position else 0
                 
                 # 2. 如果当前没有跟踪的持仓
                 if self._tracked_position is None:
@@ -837,25 +1018,25 @@ class MarketMaker:
                             side, abs(current_qty), entry_price
                         )
                         
-                        # 2.2 挂止盈 + 止损单
-                        await self._place_tp_order(self._tracked_position)
-                        await self._place_sl_order(self._tracked_position)
+                        # 2.2 挂止盈 + 止损单（两笔互不依赖，并发提交）
+                        await asyncio.gather(
+                            self._place_exit_order(self._tracked_position, "tp"),
+                            self._place_exit_order(self._tracked_position, "sl"),
+                        )
                         
                         # 2.3 发送通知
                         if self.notifier:
-                            await self.notifier.send(
+                            self.notifier.send_nowait(
                                 f"⚠️ *新增持仓（分层止盈止损）*\n"
                                 f"账户: `{self.account_name}`\n"
                                 f"交易对: `{self.symbol}`\n"
                                 f"方向: {side}\n"
                                 f"数量: {abs(current_qty):.4f}\n"
                                 f"入场价: {entry_price:.2f}\n"
-                                f"一级止盈: {self._position_quick_tp_bps:.1f}bps @ {entry_price * (1 + self._position_quick_tp_bps / 10000 if side == 'buy' else 1 - self._position_quick_tp_bps / 10000):.2f}\n"
+                                f"一级止盈: {self._position_quick_tp_bps:.1f}bps @ {entry_price * self._tp_price_mult[side]:.2f}\n"
                                 f"止损: {self._position_stop_loss_bps:.1f}bps"
                             )
                     
-                    # 2.4 正常循环间隔
-                    await asyncio.sleep(0.5)
                     continue
                 
                 # 3. 有跟踪的持仓，检查状态变化
@@ -864,7 +1045,7 @@ class MarketMaker:
                     self.logger.info("✅ 持仓已清（成交或平仓完成）")
                     
                     if self.notifier:
-                        await self.notifier.send(
+                        self.notifier.send_nowait(
                             f"✅ *持仓已清*\n"
                             f"账户: `{self.account_name}`\n"
                             f"交易对: `{self.symbol}`\n"
@@ -874,11 +1055,10 @@ class MarketMaker:
                         )
                     
                     self._tracked_position = None
-                    await asyncio.sleep(0.5)
                     continue
                 
                 # 4. 持仓状态管理（分阶段处理）
-                elapsed = time.time() - self._tracked_position["entry_time"]
+                elapsed = time.monotonic() - self._tracked_position["entry_time"]
                 
                 # 4.1 持仓超时保护（超过最大持仓时间 -> 强制市价平仓）
                 if elapsed > self._max_position_hold_time:
@@ -891,7 +1071,7 @@ class MarketMaker:
                     await self._market_close_position(self._tracked_position)
                     
                     if self.notifier:
-                        await self.notifier.send(
+                        self.notifier.send_nowait(
                             f"🔴 *持仓超时强制平仓*\n"
                             f"账户: `{self.account_name}`\n"
                             f"交易对: `{self.symbol}`\n"
@@ -899,7 +1079,6 @@ class MarketMaker:
                         )
                     
                     self._tracked_position = None
-                    await asyncio.sleep(0.5)
                     continue
                 
                 # 4.2 进行中阶段：等待hold_seconds秒 -> 尝试二级止盈
@@ -921,7 +1100,7 @@ class MarketMaker:
                         if success:
                             self.logger.info("二级市价止盈已执行")
                             if self.notifier:
-                                await self.notifier.send(
+                                self.notifier.send_nowait(
                                     f"💰 *二级市价止盈已执行*\n"
                                     f"账户: `{self.account_name}`\n"
                                     f"交易对: `{self.symbol}`\n"
@@ -933,8 +1112,6 @@ class MarketMaker:
                             # 市价平仓失败，继续等待或回到hold继续监控
                             self.logger.warning("二级市价止盈失败，继续等待")
                 
-                await asyncio.sleep(0.5)
-                
             except Exception as e:
                 self.logger.exception("持仓监控循环异常: %s", e)
                 await asyncio.sleep(1.0)  # 出错后等待1秒再继续
@@ -963,7 +1140,7 @@ class MarketMaker:
                     break
                 
                 # 查询余额
-                balance = await api.query_balance(self.auth)
+                balance = await self._get_balance()
                 
                 # 格式化余额信息
                 total_balance = float(balance.get("balance", "0"))
@@ -974,8 +1151,7 @@ class MarketMaker:
                 locked = float(balance.get("locked", "0"))
                 
                 # 发送Telegram汇报
-                beijing_tz = ZoneInfo("Asia/Shanghai")
-                beijing_time = datetime.now(beijing_tz).strftime("%Y-%m-%d %H:%M:%S")
+                beijing_time = self._beijing_now_str()
                 
                 message = (
                     f"💰 *账户余额汇报*\n"
@@ -994,7 +1170,7 @@ class MarketMaker:
                     f"锁定: ${locked:.2f}"
                 )
                 
-                await self.notifier.send(message)
+                self.notifier.send_nowait(message)
                 self.logger.info("✅ 余额汇报已发送: 总余额=%.2f, 权益=%.2f", total_balance, equity)
                 
             except asyncio.CancelledError:
@@ -1012,35 +1188,58 @@ class MarketMaker:
         Args:
             reason: 重挂原因
         """
+        if not self._replace_limiter.acquire():
+            self.logger.warning("重挂过于频繁，已限速，跳过本次重挂: %s", reason)
+            return
+        
         self.logger.info("订单需重挂，原因: %s", reason)
         
-        # 取消所有订单并等待确认
+        # 撤单确认期间并行等待下一次价格推送，撤单完成后可直接用新价格下单
+        price_task = asyncio.create_task(
+            self.exchange_adapter.wait_for_new_price(timeout=self.REPLACE_PRICE_TIMEOUT)
+        )
         try:
-            await self.exchange_adapter.cancel_all_orders(symbol=self.symbol)
-        except RuntimeError as e:
-            if "订单流未连接" in str(e):
-                self.logger.warning("订单流未连接，尝试重连后重试取消订单...")
-                try:
-                    await self.exchange_adapter.connect_order_stream(self.auth)
+            # 取消所有订单并等待确认
+            # 订单流断开时直接用 HTTP 批量撤单（一次请求），不必先等待重连
+            try:
+                if self.exchange_adapter.is_order_stream_connected():
                     await self.exchange_adapter.cancel_all_orders(symbol=self.symbol)
-                except Exception as reconnect_error:
-                    self.logger.exception("订单流重连/取消失败，跳过本次重挂: %s", reconnect_error)
+                else:
+                    await self.exchange_adapter.cancel_all_orders_bulk(symbol=self.symbol)
+            except RuntimeError as e:
+                if "订单流未连接" in str(e):
+                    self.logger.warning("订单流未连接，尝试重连后重试取消订单...")
+                    try:
+                        await self.exchange_adapter.connect_order_stream(self.auth)
+                        await self.exchange_adapter.cancel_all_orders(symbol=self.symbol)
+                    except Exception as reconnect_error:
+                        self.logger.exception("订单流重连/取消失败，跳过本次重挂: %s", reconnect_error)
+                        return
+                else:
+                    self.logger.exception("取消订单失败，跳过本次重挂: %s", e)
                     return
-            else:
-                self.logger.exception("取消订单失败，跳过本次重挂: %s", e)
-                return
 
-        cancel_success = await self.exchange_adapter.wait_for_order_count(
-            0, 0, timeout=3.0
-        )
-        if not cancel_success:
-            self.logger.warning("订单取消确认超时，跳过下单")
-            return
+            cancel_success = await self.exchange_adapter.wait_for_order_count(
+                0, 0, timeout=3.0
+            )
+            if not cancel_success:
+                self.logger.warning("订单取消确认超时，跳过下单")
+                return
+            
+            # 下单使用撤单期间到达的最新价格；行情推送中断时改用 HTTP 中间价，
+            # 不等推送超时（推送中断时等待只会撤单后空等 REPLACE_PRICE_TIMEOUT）
+            if not (await self.exchange_adapter.refresh_mid_price_from_rest() or await price_task):
+                self.logger.warning("获取市场价格超时，取消下单")
+                return
+        finally:
+            if not price_task.done():
+                price_task.cancel()
         
-        # 下单时等待最新价格，并等待确认
-        await self.place_orders()
+        # 下单前记录确认计数，避免下单过程中已到达的确认被漏计
+        acks_before = self.exchange_adapter.get_order_ack_counts()
+        await self.place_orders(self.exchange_adapter.get_depth_mid_price())
         order_success = await self.exchange_adapter.wait_for_orders(
-            count=2, timeout=5.0
+            count=2, timeout=5.0, since=acks_before
         )
         if not order_success:
             self.logger.warning("订单下单确认超时，将在下次循环检查")
@@ -1048,9 +1247,41 @@ class MarketMaker:
 
     async def cleanup(self):
         """清理所有订单和资源"""
-        await self.exchange_adapter.cancel_all_orders(symbol=self.symbol)
+        # 退出时订单流可能已断开，优先用 HTTP 批量撤单；同时取消本地缓存未记录的服务器挂单
+        await self.exchange_adapter.cancel_all_orders_bulk(symbol=self.symbol, include_server=True)
         await self.exchange_adapter.close_position(symbol=self.symbol)
         await self.exchange_adapter.cleanup()
+        # 撤单/平仓的 HTTP 请求都已完成，关闭连接池中的 keep-alive 连接
+        self.auth.close()
+
+
+def _pin_event_loop_cpu(cpu: int, logger: logging.Logger):
+    """
+    将当前（事件循环）线程绑定到 cpu，其他线程使用原 CPU 集合中除 cpu 以外的部分
+
+    Linux 上 sched_setaffinity(0) 只作用于调用线程，之后新建的线程继承调用线程的掩码：
+    REST 线程池与默认线程池通过 initializer 改回其余 CPU，已存在的线程（日志监听线程等）按线程 ID 调整，
+    阻塞的 REST 调用/TLS/签名不会和事件循环抢同一个核
+
+    Args:
+        cpu: 事件循环线程使用的 CPU 编号
+        logger: 日志实例
+    """
+    original_cpus = os.sched_getaffinity(0)
+    helper_cpus = original_cpus - {cpu}
+    if not helper_cpus:
+        logger.warning("可用 CPU 只有 %d，其他线程无法与事件循环分开", cpu)
+        helper_cpus = original_cpus
+
+    os.sched_setaffinity(0, {cpu})
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and thread.native_id is not None:
+            os.sched_setaffinity(thread.native_id, helper_cpus)
+    api.set_api_worker_cpus(helper_cpus)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(initializer=os.sched_setaffinity, initargs=(0, helper_cpus))
+    )
+    logger.info("事件循环线程已绑定到 CPU %d，其他线程使用 CPU %s", cpu, sorted(helper_cpus))
 
 
 async def main():
@@ -1063,6 +1294,14 @@ async def main():
     logger = get_logger(__name__)
     logger.info("使用配置文件: %s", args.config)
 
+    # 可选：将事件循环线程绑定到指定 CPU（避免调度迁移带来的缓存失效），其他线程留在其余 CPU 上
+    cpu_id = os.getenv("MARKET_MAKER_CPU")
+    if cpu_id:
+        try:
+            _pin_event_loop_cpu(int(cpu_id), logger)
+        except (AttributeError, ValueError, OSError) as e:
+            logger.warning("绑定 CPU 失败: %s", e)
+
     # 加载配置
     private_key = os.getenv("WALLET_PRIVATE_KEY")
     ed25519_key = os.getenv("ED25519_PRIVATE_KEY")
@@ -1102,7 +1341,8 @@ async def main():
     notifier = Notifier.from_env()
 
     try:
-        auth.authenticate()
+        # 认证包含多次同步 HTTP 请求，放到线程中执行
+        await asyncio.to_thread(auth.authenticate)
         logger.info("认证成功")
     except Exception as e:
         logger.exception("认证失败: %s", e)
@@ -1115,9 +1355,11 @@ async def main():
     midprice_method = os.getenv("MIDPRICE_METHOD", "vwa")  # "simple", "vwa", "vwap"
     standx_adapter = StandXAdapter(symbol=symbol, depth_levels=depth_levels, midprice_method=midprice_method)
     logger.info("初始化 StandX 适配器: 中间价计算方式=%s, 深度档数=%d", midprice_method, depth_levels)
-    # 订阅depth_book频道
-    await standx_adapter.subscribe_depth_book()
-    await standx_adapter.connect_order_stream(auth)
+    # 订阅depth_book频道与连接订单流互不依赖，并发建连以缩短启动到首次挂单的时间
+    await asyncio.gather(
+        standx_adapter.subscribe_depth_book(),
+        standx_adapter.connect_order_stream(auth),
+    )
 
     # 创建做市器
     # 从log_prefix获取账户名
@@ -1150,13 +1392,22 @@ async def main():
         await market_maker.cleanup()
         
         # 停止通知
-        await notifier.send(
+        notifier.send_nowait(
             f"*做市策略已停止*\n" f"账户: `{account_name}`\n" f"交易对: `{symbol}`\n" f"订单已清理完成"
         )
+        # 退出前等待后台队列中的通知发送完毕
+        await notifier.flush()
 
 
 if __name__ == "__main__":
+    # 可选依赖：安装了 uvloop 时使用其事件循环（Linux 下 IO 开销更低），否则回退到默认循环
+    try:
+        import uvloop
+        run_loop = uvloop.run
+    except ImportError:
+        run_loop = asyncio.run
+
     try:
-        asyncio.run(main())
+        run_loop(main())
     except KeyboardInterrupt:
         pass  # 优雅退出，不显示traceback
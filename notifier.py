@@ -1,9 +1,12 @@
 """
 Telegram 通知模块
 支持时间限流，防止高频事件刷屏
+支持后台队列发送，避免网络请求阻塞主流程
 """
 
 # 标准库导入
+import asyncio
+import heapq
 import os
 import time
 from typing import Optional
@@ -15,17 +18,82 @@ import requests
 class Notifier:
     """Telegram 通知器（带限流）"""
     
+    QUEUE_MAXSIZE = 100  # 后台队列上限，Telegram 不可用时丢弃新消息而不是无限堆积
+    MAX_MESSAGE_LENGTH = 4096  # Telegram 单条消息长度上限，后台合并发送时不超过该长度
+    MARKDOWN_MARKERS = frozenset("*_`[")  # 消息包含这些字符时才按 Markdown 解析
+    
     def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None):
         self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")
         self.enabled = bool(self.bot_token and self.chat_id)
         
-        # 限流状态（用于订单重挂等高频事件）
+        # 复用到 Telegram 的 keep-alive 连接，连续通知不必每条重新 TCP/TLS 握手
+        self._session = requests.Session()
+        self._send_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        
+        # 限流状态（用于订单重挂等高频事件）：限流键 -> 窗口结束时间（单调时钟）
         self._throttle_state = {}
+        # 按窗口结束时间排序的最小堆 (expiry, key)，过期键出堆时从 _throttle_state 删除，避免字典无限增长
+        self._throttle_expiry = []
+        
+        # 后台发送队列（首次 send_nowait 时在当前事件循环中创建）
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+    
+    def _is_throttled(self, throttle_key: Optional[str], throttle_seconds: int) -> bool:
+        """检查限流窗口，未被限流时记录本次发送时间"""
+        if not throttle_key or throttle_seconds <= 0:
+            return False
+        
+        now = time.monotonic()
+        
+        # 清理窗口已结束的限流键（每个键在字典中时堆里恰有一条对应记录）
+        expiry_heap = self._throttle_expiry
+        while expiry_heap and expiry_heap[0][0] <= now:
+            _, key = heapq.heappop(expiry_heap)
+            del self._throttle_state[key]
+        
+        if throttle_key in self._throttle_state:
+            return True  # 在限流窗口内，跳过
+        
+        expiry = now + throttle_seconds
+        self._throttle_state[throttle_key] = expiry
+        heapq.heappush(expiry_heap, (expiry, throttle_key))
+        return False
+    
+    def _post(self, text: str) -> bool:
+        """同步调用 Telegram sendMessage 接口"""
+        return self._post_status(text) == 200
+    
+    def _post_status(self, text: str) -> Optional[int]:
+        """同步调用 Telegram sendMessage 接口，返回 HTTP 状态码（网络错误时为 None）"""
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "disable_web_page_preview": True,  # 错误信息中可能带有接口 URL，不生成链接预览
+        }
+        # 纯文本消息不带 parse_mode，Telegram 无需再做 Markdown 解析
+        if not self.MARKDOWN_MARKERS.isdisjoint(text):
+            payload["parse_mode"] = "Markdown"
+        try:
+            response = self._session.post(self._send_url, json=payload, timeout=10)
+            return response.status_code
+        except Exception:
+            # 静默失败，避免影响主流程
+            return None
+    
+    def _post_batch(self, texts: list):
+        """同步发送一批合并消息；Telegram 拒绝合并后的消息时逐条重发"""
+        status = self._post_status("\n\n".join(texts))
+        # 某条消息（如包含异常文本）的 Markdown 不合法会导致整批被拒，逐条重发以免连带丢失其他通知；
+        # 网络错误时不重发，避免每条都再等一次超时
+        if status is not None and status != 200 and len(texts) > 1:
+            for text in texts:
+                self._post(text)
     
     async def send(self, text: str, throttle_key: Optional[str] = None, throttle_seconds: int = 0):
         """
-        发送 Telegram 消息
+        发送 Telegram 消息（等待发送完成）
         
         Args:
             text: 消息内容
@@ -38,32 +106,78 @@ class Notifier:
         if not self.enabled:
             return False
         
-        # 限流检查
-        if throttle_key and throttle_seconds > 0:
-            now = time.time()
-            last_time = self._throttle_state.get(throttle_key, 0)
-            
-            if now - last_time < throttle_seconds:
-                return False  # 在限流窗口内，跳过
-            
-            self._throttle_state[throttle_key] = now
+        if self._is_throttled(throttle_key, throttle_seconds):
+            return False
         
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            response = requests.post(
-                url,
-                json={
-                    "chat_id": self.chat_id,
-                    "text": text,
-                    "parse_mode": "Markdown",
-                    "disable_web_page_preview": True,
-                },
-                timeout=10,
-            )
-            return response.status_code == 200
-        except Exception:
-            # 静默失败，避免影响主流程
+        # HTTP 请求放到线程中执行，避免阻塞事件循环
+        return await asyncio.to_thread(self._post, text)
+    
+    def send_nowait(self, text: str, throttle_key: Optional[str] = None, throttle_seconds: int = 0) -> bool:
+        """
+        将消息放入后台队列发送，立即返回（不等待网络请求）
+        
+        Args:
+            text: 消息内容
+            throttle_key: 限流键，同 send()
+            throttle_seconds: 限流窗口时长（秒），同 send()
+        
+        Returns:
+            是否已入队
+        """
+        if not self.enabled:
             return False
+        
+        if self._is_throttled(throttle_key, throttle_seconds):
+            return False
+        
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_MAXSIZE)
+            self._worker_task = asyncio.create_task(self._worker())
+        
+        try:
+            self._queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False  # 队列已满（发送持续失败），丢弃本条
+        return True
+    
+    async def _worker(self):
+        """后台发送任务：取出队列中已积压的消息，合并为一条发送（不超过长度上限）"""
+        carry: Optional[str] = None  # 上一批放不下、留到下一批发送的消息
+        while True:
+            texts = [carry if carry is not None else await self._queue.get()]
+            carry = None
+            length = len(texts[0])
+            while not self._queue.empty():
+                text = self._queue.get_nowait()
+                if length + 2 + len(text) > self.MAX_MESSAGE_LENGTH:
+                    carry = text
+                    break
+                texts.append(text)
+                length += 2 + len(text)
+            try:
+                await asyncio.to_thread(self._post_batch, texts)
+            finally:
+                for _ in texts:
+                    self._queue.task_done()
+    
+    async def flush(self, timeout: float = 10.0):
+        """
+        等待队列中的消息发送完毕并停止后台任务（用于退出前）
+        
+        Args:
+            timeout: 最长等待时间（秒），超时后丢弃剩余消息
+        """
+        if self._queue is None:
+            return
+        
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._worker_task.cancel()
+            self._queue = None
+            self._worker_task = None
     
     @staticmethod
     def from_env() -> "Notifier":
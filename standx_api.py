@@ -5,19 +5,63 @@ Provides cleaner separation of concerns - standx_auth.py handles auth, this modu
 """
 
 # 标准库导入
+import asyncio
+import functools
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 可选依赖：安装了 orjson 时用于序列化签名请求体（直接输出紧凑格式的 bytes），否则回退到标准库
+try:
+    import orjson
+
+    _dumps_compact = orjson.dumps
+except ImportError:
+
+    def _dumps_compact(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 # 本地模块导入
-from standx_auth import StandXAuth
+from standx_auth import StandXAuth, HTTP_POOL_MAXSIZE
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# REST 工作线程允许运行的 CPU 集合（None 表示不限制），事件循环线程绑定专用 CPU 时由 set_api_worker_cpus() 设置
+_api_worker_cpus = None
+
+
+def set_api_worker_cpus(cpus: set):
+    """Restrict REST worker threads started after this call to the given CPUs (Linux only)."""
+    global _api_worker_cpus
+    _api_worker_cpus = set(cpus)
+
+
+def _init_api_worker():
+    """Worker thread initializer: apply the CPU set from set_api_worker_cpus(), if any."""
+    if _api_worker_cpus is not None:
+        os.sched_setaffinity(0, _api_worker_cpus)
+
+
+# REST 调用专用线程池：并发数与 HTTP 连接池一致（不会因超出连接池而丢弃 keep-alive 连接），
+# 也不与通知发送等其他 to_thread 任务争用默认线程池
+_api_executor = ThreadPoolExecutor(
+    max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="standx-api", initializer=_init_api_worker
+)
+
+
+async def _api_call(auth: StandXAuth, endpoint: str, **kwargs) -> dict:
+    """Run the blocking auth.make_api_call on the API worker pool so the event loop keeps serving WS pushes."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _api_executor, functools.partial(auth.make_api_call, endpoint, **kwargs)
+    )
+
 
 async def query_balance(auth: StandXAuth) -> dict:
     """Query unified user balance snapshot"""
     try:
-        return auth.make_api_call("/api/query_balance")
+        return await _api_call(auth, "/api/query_balance")
     except Exception as e:
         msg = str(e)
         if "status=404" in msg and "user balance not found" in msg:
@@ -38,15 +82,15 @@ async def query_balance(auth: StandXAuth) -> dict:
         raise
 
 
-def query_symbol_price(auth: StandXAuth, symbol: str) -> dict:
+async def query_symbol_price(auth: StandXAuth, symbol: str) -> dict:
     """Public: Query symbol price snapshot (index/mark/last/mid)"""
-    return auth.make_api_call("/api/query_symbol_price", params={"symbol": symbol})
+    return await _api_call(auth, "/api/query_symbol_price", params={"symbol": symbol})
 
 
 async def query_positions(auth: StandXAuth, symbol: str = None) -> list:
     """Query user positions (optionally filtered by symbol)"""
     params = {"symbol": symbol} if symbol else None
-    result = auth.make_api_call("/api/query_positions", params=params)
+    result = await _api_call(auth, "/api/query_positions", params=params)
     # API returns a list directly
     return result if isinstance(result, list) else []
 
@@ -88,14 +132,16 @@ async def new_limit_order(
         payload["margin_mode"] = margin_mode
     if leverage is not None:
         payload["leverage"] = leverage
-    payload_str = json.dumps(payload, separators=(",", ":"))
-    headers_extra = auth._body_signature_headers(payload_str)
-    return auth.make_api_call(
+    # 签名与发送的是同一份 bytes，不再各自编码
+    payload_bytes = _dumps_compact(payload)
+    headers_extra = auth._body_signature_headers(payload_bytes)
+    return await _api_call(
+        auth,
         "/api/new_order",
         method="POST",
         data=payload,
         headers_extra=headers_extra,
-        raw_body=payload_str,
+        raw_body=payload_bytes,
     )
 
 
@@ -133,14 +179,15 @@ async def new_market_order(
         payload["margin_mode"] = margin_mode
     if leverage is not None:
         payload["leverage"] = leverage
-    payload_str = json.dumps(payload, separators=(",", ":"))
-    headers_extra = auth._body_signature_headers(payload_str)
-    return auth.make_api_call(
+    payload_bytes = _dumps_compact(payload)
+    headers_extra = auth._body_signature_headers(payload_bytes)
+    return await _api_call(
+        auth,
         "/api/new_order",
         method="POST",
         data=payload,
         headers_extra=headers_extra,
-        raw_body=payload_str,
+        raw_body=payload_bytes,
     )
 
 
@@ -167,18 +214,54 @@ async def cancel_order(
     if cl_ord_id is not None:
         payload["cl_ord_id"] = cl_ord_id
 
-    payload_str = json.dumps(payload, separators=(",", ":"))
-    headers_extra = auth._body_signature_headers(payload_str)
-    return auth.make_api_call(
+    payload_bytes = _dumps_compact(payload)
+    headers_extra = auth._body_signature_headers(payload_bytes)
+    return await _api_call(
+        auth,
         "/api/cancel_order",
         method="POST",
         data=payload,
         headers_extra=headers_extra,
-        raw_body=payload_str,
+        raw_body=payload_bytes,
+    )
+
+
+async def cancel_orders(
+    auth: StandXAuth, order_ids: list = None, cl_ord_ids: list = None
+) -> dict:
+    """
+    Cancel multiple orders in one request (requires body signature).
+
+    Args:
+        auth: StandXAuth instance
+        order_ids: Order IDs to cancel (at least one of order_ids or cl_ord_ids required)
+        cl_ord_ids: Client order IDs to cancel
+
+    Returns:
+        Response with code, message, and request_id
+    """
+    if not order_ids and not cl_ord_ids:
+        raise ValueError("At least one of order_ids or cl_ord_ids is required")
+
+    payload = {}
+    if order_ids:
+        payload["order_id_list"] = list(order_ids)
+    if cl_ord_ids:
+        payload["cl_ord_id_list"] = list(cl_ord_ids)
+
+    payload_bytes = _dumps_compact(payload)
+    headers_extra = auth._body_signature_headers(payload_bytes)
+    return await _api_call(
+        auth,
+        "/api/cancel_orders",
+        method="POST",
+        data=payload,
+        headers_extra=headers_extra,
+        raw_body=payload_bytes,
     )
 
 
-def query_order(auth: StandXAuth, order_id: int = None, cl_ord_id: str = None) -> dict:
+async def query_order(auth: StandXAuth, order_id: int = None, cl_ord_id: str = None) -> dict:
     """Query order status by order_id or cl_ord_id (at least one required)."""
     params = {}
     if order_id is not None:
@@ -187,7 +270,7 @@ def query_order(auth: StandXAuth, order_id: int = None, cl_ord_id: str = None) -
         params["cl_ord_id"] = cl_ord_id
     if not params:
         raise ValueError("At least one of order_id or cl_ord_id is required")
-    return auth.make_api_call("/api/query_order", params=params)
+    return await _api_call(auth, "/api/query_order", params=params)
 
 
 async def query_open_orders(
@@ -199,10 +282,10 @@ async def query_open_orders(
         params["symbol"] = symbol
     if limit is not None:
         params["limit"] = limit
-    return auth.make_api_call("/api/query_open_orders", params=params)
+    return await _api_call(auth, "/api/query_open_orders", params=params)
 
 
-def query_orders(
+async def query_orders(
     auth: StandXAuth, symbol: str = None, status: str = None, limit: int = None
 ) -> dict:
     """Query all orders (open/closed), optionally filtered by symbol/status."""
@@ -213,4 +296,4 @@ def query_orders(
         params["status"] = status
     if limit is not None:
         params["limit"] = limit
-    return auth.make_api_call("/api/query_orders", params=params)
+    return await _api_call(auth, "/api/query_orders", params=params)
@@ -7,14 +7,15 @@ Implements wallet-based signature authentication with Ed25519 and Ethereum signi
 import os
 import json
 import base64
+import logging
 import time
 import uuid
-from functools import wraps
-from typing import Dict
+from functools import cached_property, wraps
+from typing import Dict, Union
 
 # 第三方库导入
 import requests
-import jwt
+from requests.adapters import HTTPAdapter
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from base58 import b58encode, b58decode
@@ -36,6 +37,8 @@ CHAIN = "bsc"
 DEFAULT_TIMEOUT = 30  # 增加超时时间到30秒
 MAX_RETRIES = 3  # 最大重试次数
 RETRY_DELAY = 1  # 重试延迟（秒）- 优化为1秒
+HTTP_POOL_CONNECTIONS = 8  # 连接池数量（按主机）
+HTTP_POOL_MAXSIZE = 16  # 每个主机保持的最大连接数（并发查询/下单共用）
 
 
 def retry_on_network_error(max_retries=MAX_RETRIES, delay=RETRY_DELAY):
@@ -103,6 +106,17 @@ class StandXAuth:
         # 初始化logger
         self.logger = get_logger(__name__)
         
+        # 复用 keep-alive 连接，避免每次请求重新进行 TCP/TLS 握手
+        self.session = requests.Session()
+        http_adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE
+        )
+        self.session.mount("https://", http_adapter)
+        self.session.mount("http://", http_adapter)
+        # 认证请求头按 token 缓存，token 不变时各 API 调用共用同一份
+        self._api_headers: Dict[str, str] = {}
+        self._api_headers_token = None
+        
         # Normalize None/empty to None
         private_key = private_key if private_key else None
         ed25519_key = ed25519_key if ed25519_key else None
@@ -188,9 +202,14 @@ class StandXAuth:
                 f"ED25519_PRIVATE_KEY 格式错误，必须是 44 字符的 base58 编码字符串: {e}"
             )
 
-        self.request_id = b58encode(
-            self.ed25519_signing_key.verify_key.encode()
-        ).decode()
+    @cached_property
+    def request_id(self) -> str:
+        """
+        Base58-encoded Ed25519 public key, sent as requestId in prepare-signin.
+
+        Computed on first use: the token-based scheme never signs in, so it never needs it.
+        """
+        return b58encode(self.ed25519_signing_key.verify_key.encode()).decode()
 
     @retry_on_network_error()
     def _get_prepare_signin_data(self) -> dict:
@@ -210,7 +229,7 @@ class StandXAuth:
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 PREPARE_SIGNIN_URL,
                 params=params,
                 json=payload,
@@ -254,20 +273,22 @@ class StandXAuth:
 
         try:
             # Decode without verification (as we don't have StandX's public key here)
-            # In production, verify with: jwt.decode(signed_data, public_key, algorithms=["ES256"])
-            decoded = jwt.decode(signed_data, options={"verify_signature": False})
-
-            message = decoded.get("message")
-            if not message:
-                raise Exception("No message field in JWT payload")
-
-            logger.debug("Extracted message (truncated): %s...", message[:50])
-            return message
-
-        except jwt.DecodeError as e:
+            # In production, verify the ES256 signature with StandX's public key
+            # 只需读取 payload 段：直接 base64url 解码中间一段，不依赖 PyJWT
+            payload_segment = signed_data.split(".")[1]
+            padding = "=" * (-len(payload_segment) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(payload_segment + padding))
+        except (IndexError, ValueError) as e:
             logger.exception("JWT decode error: %s", str(e))
             raise Exception(f"JWT decode error: {str(e)}")
 
+        message = decoded.get("message") if isinstance(decoded, dict) else None
+        if not message:
+            raise Exception("No message field in JWT payload")
+
+        logger.debug("Extracted message (truncated): %s...", message[:50])
+        return message
+
     def _sign_message(self, message: str) -> str:
         """
         Step 3: Sign the message with wallet private key using Ethereum signing
@@ -322,7 +343,7 @@ class StandXAuth:
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 LOGIN_URL,
                 params={"chain": CHAIN},
                 json=payload,
@@ -396,6 +417,10 @@ class StandXAuth:
         """Get current access token for API calls"""
         return self.token
 
+    def close(self):
+        """Close the pooled HTTP session (keep-alive connections) on shutdown"""
+        self.session.close()
+
     @retry_on_network_error()
     def make_api_call(
         self,
@@ -404,7 +429,7 @@ class StandXAuth:
         data: dict = None,
         params: dict = None,
         headers_extra: dict = None,
-        raw_body: str = None,
+        raw_body: Union[str, bytes] = None,
     ) -> dict:
         """
         Make authenticated API call to StandX
@@ -423,22 +448,24 @@ class StandXAuth:
         # Normalize endpoint to avoid trailing-slash 404s
         normalized_endpoint = endpoint.rstrip("/") if endpoint else ""
         url = f"{PERPS_BASE_URL}{normalized_endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        if headers_extra:
-            headers.update(headers_extra)
+        if self._api_headers_token != self.token:
+            self._api_headers = {
+                "Authorization": f"Bearer {self.token}",
+                "Content-Type": "application/json",
+            }
+            self._api_headers_token = self.token
+        # 缓存的请求头只读共享（requests 合并请求头时不修改传入的字典）
+        headers = {**self._api_headers, **headers_extra} if headers_extra else self._api_headers
 
         try:
             method_up = method.upper()
             if method_up == "GET":
-                response = requests.get(
+                response = self.session.get(
                     url, headers=headers, params=params, timeout=DEFAULT_TIMEOUT
                 )
             elif method_up == "POST":
                 if raw_body is not None:
-                    response = requests.post(
+                    response = self.session.post(
                         url,
                         data=raw_body,
                         headers=headers,
@@ -446,7 +473,7 @@ class StandXAuth:
                         timeout=DEFAULT_TIMEOUT,
                     )
                 else:
-                    response = requests.post(
+                    response = self.session.post(
                         url,
                         json=data,
                         headers=headers,
@@ -489,14 +516,14 @@ class StandXAuth:
             logger.exception("API call RequestException: %s %s", str(e), detail)
             raise Exception(f"API call failed: {str(e)}{detail}")
 
-    def _body_signature_headers(self, payload_str: str) -> dict:
-        """Build body signature headers (ed25519, base64)."""
+    def _body_signature_headers(self, payload: Union[str, bytes]) -> dict:
+        """Build body signature headers (ed25519, base64). payload may be the serialized body as str or UTF-8 bytes."""
         x_request_id = str(uuid.uuid4())
-        x_request_timestamp = str(int(time.time() * 1000))  # milliseconds
-        message = f"v1,{x_request_id},{x_request_timestamp},{payload_str}"
-        signature_bytes = self.ed25519_signing_key.sign(
-            message.encode("utf-8")
-        ).signature
+        x_request_timestamp = str(time.time_ns() // 1_000_000)  # milliseconds（整数运算，不经过浮点乘法）
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        message = f"v1,{x_request_id},{x_request_timestamp},".encode() + payload
+        signature_bytes = self.ed25519_signing_key.sign(message).signature
         signature_b64 = base64.b64encode(signature_bytes).decode()
         return {
             "x-request-sign-version": "v1",
@@ -521,8 +548,7 @@ class StandXAuth:
         """
         version = "v1"
         message = f"{version},{request_id},{timestamp},{payload}"
-        logger.info("Signing request message with Ed25519 key")
-        logger.info(f"message: {message}")
+        logger.debug("Signing request message with Ed25519 key: %s", message)
         message_bytes = message.encode("utf-8")
 
         signature = self.ed25519_signing_key.sign(message_bytes)
@@ -562,27 +588,34 @@ def main():
     auth_response = auth.authenticate()
     logger.debug("Authentication response: %s", auth_response)
 
+    # Pretty-printed dumps below are only built when DEBUG logging is enabled
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     # Debug: auth response and public price (redacted in logs)
-    logger.debug(
-        "Full Authentication Response: %s", json.dumps(auth_response, indent=2)
-    )
+    if debug:
+        logger.debug(
+            "Full Authentication Response: %s", json.dumps(auth_response, indent=2)
+        )
 
     # Public sanity check: query symbol price
     symbol = os.getenv("MARKET_MAKER_SYMBOL", "BTC-USD")
     price = auth.query_symbol_price(symbol)
-    logger.debug("Public Price (%s): %s", symbol, json.dumps(price, indent=2))
+    if debug:
+        logger.debug("Public Price (%s): %s", symbol, json.dumps(price, indent=2))
 
     # Query and log user balance (graceful on empty account)
     try:
         balance = auth.query_balance()
-        logger.debug("User Balance: %s", json.dumps(balance, indent=2))
+        if debug:
+            logger.debug("User Balance: %s", json.dumps(balance, indent=2))
     except Exception as e:
         logger.warning("查询余额失败: %s", e)
 
     # Query and print user positions
     try:
         positions = auth.query_positions(symbol=symbol)
-        logger.debug("User Positions: %s", json.dumps(positions, indent=2))
+        if debug:
+            logger.debug("User Positions: %s", json.dumps(positions, indent=2))
         if positions:
             position = positions[0] if positions else None
             current_leverage = int(position["leverage"]) if position else None
@@ -633,7 +666,8 @@ def main():
         logger.info(
             "Placed %s limit order @ %s (%s bps adj)", side, limit_price_str, bps
         )
-        logger.debug("Order response: %s", json.dumps(order_resp, indent=2))
+        if debug:
+            logger.debug("Order response: %s", json.dumps(order_resp, indent=2))
     except Exception as e:
         logger.exception("下单失败: %s", e)
         order_request_id = None